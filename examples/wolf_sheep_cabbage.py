@@ -20,11 +20,10 @@ Usage:
 python ./wolf_sheep_cabbage.py [graph.png]
 """
 
-from itertools import product
 from sys import argv
 from typing import NamedTuple
 
-from tundra import Graph, algorithm, util
+from tundra import Graph, ImplicitGraph, algorithm, util
 
 
 class State(NamedTuple):
@@ -53,23 +52,47 @@ def valid(state):
     return (w != s or w == b) and (s != c or s == b)
 
 
-def has_edge(s1, s2):
-    if s1.boat == s2.boat:
-        return False
+def crossings(state):
+    """
+    Yields the valid states reached by the farmer crossing the river,
+    either alone or carrying one purchase from his side
+    """
+    for cargo in (None, 'wolf', 'sheep', 'cabbage'):
+        if cargo is None:
+            moved = {}
+        elif getattr(state, cargo) == state.boat:
+            moved = {cargo: not state.boat}
+        else:
+            continue
+
+        s = state._replace(boat=not state.boat, **moved)
 
-    w = s1.wolf == s2.wolf
-    s = s1.sheep == s2.sheep
-    c = s1.cabbage == s2.cabbage
+        if valid(s):
+            yield s
 
-    return (w + s + c) in (2, 3)
 
+def explore(space, start):
+    """
+    Builds the explicit graph of the states reachable from start
+    """
+    states = [s for s, _, _ in algorithm.iter_bfs(space, start)]
 
-def export_solution(graph, solution):
+    return Graph(
+        states,
+        {
+            (min(s1, s2), max(s1, s2))
+            for s1 in states
+            for s2 in space.iter_successors(s1)
+        }
+    )
+
+
+def export_solution(space, solution):
     if len(argv) > 1:
         solution_edges = set(zip(solution, solution[1:]))
 
         util.export_png(
-            graph,
+            explore(space, solution[0]),
             argv[1],
             command=util.Filter.DOT,
             edge_color=(
@@ -81,29 +104,16 @@ def export_solution(graph, solution):
         )
 
 
-states = {
-    s
-    for s in (State(*t) for t in product({True, False}, repeat=4))
-    if valid(s)
-}
-
-graph = Graph(
-    states,
-    {
-        (min(s1, s2), max(s1, s2))
-        for s1, s2 in product(states, repeat=2)
-        if has_edge(s1, s2)
-    }
-)
-
+# the states are only generated as the search reaches them
+space = ImplicitGraph(crossings)
 
 initial = State(True, True, True, True)
 
 final = State(False, False, False, False)
 
-solution = algorithm.dijkstra(graph, initial, final)
+solution = algorithm.dijkstra(space, initial, final)
 
-export_solution(graph, solution)
+export_solution(space, solution)
 
 print(*solution, sep='\n')
 
@@ -5,6 +5,10 @@ setup(
     version='0.1',
     packages=find_packages(),
 
+    extras_require={
+        'numpy': ['numpy'],
+    },
+
     description='Pure Python, no dependencies Graph Algorithms module',
     url='https://github.com/caiopo/tundra',
 
@@ -0,0 +1,128 @@
+import pytest
+
+from context import (ComponentIndex, Digraph, Graph, condensation,
+                     connected_components, freeze, has_directed_cycle,
+                     is_strongly_connected, strongly_connected_components)
+
+
+@pytest.fixture
+def g():
+    return Graph(range(8), {(0, 1), (1, 2), (3, 4), (5, 5)})
+
+
+def test_connected_components(g):
+    labels, sizes = connected_components(g)
+
+    assert labels == {0: 0, 1: 0, 2: 0, 3: 1, 4: 1, 5: 2, 6: 3, 7: 4}
+    assert sizes == [3, 2, 1, 1, 1]
+
+    assert connected_components(freeze(g)) == (labels, sizes)
+
+
+def test_connected_components_directed():
+    dg = Digraph(range(4), {(1, 0), (2, 1)})
+
+    labels, sizes = connected_components(dg)
+
+    assert labels == {0: 0, 1: 0, 2: 0, 3: 1}
+    assert sizes == [3, 1]
+
+
+def test_connected_components_empty():
+    assert connected_components(Graph()) == ({}, [])
+
+
+def test_component_index(g):
+    index = ComponentIndex(g)
+
+    assert index.count == 5
+    assert index.connected(0, 2)
+    assert not index.connected(2, 3)
+
+    index.link(2, 3)
+
+    assert g.has_edge(3, 2)
+    assert index.connected(0, 4)
+    assert index.component(0) == index.component(4)
+    assert index.count == 4
+
+
+def test_component_index_rebuilds(g):
+    index = ComponentIndex(g)
+
+    g.link(6, 7)
+
+    assert index.connected(6, 7)
+    assert index.count == 4
+
+    g.unlink(0, 1)
+
+    assert not index.connected(0, 2)
+    assert index.count == 5
+
+    g.insert(8)
+
+    index.link(8, 7)
+
+    assert index.connected(6, 8)
+
+
+def test_component_index_maintained(g):
+    index = ComponentIndex(g)
+
+    assert index.count == 5
+
+    forest = g._forest()
+
+    # links made on the graph itself are merged without a rebuild
+    g.link(6, 7)
+    g.link(2, 3)
+
+    assert g._forest() is forest
+    assert index.connected(0, 4)
+    assert index.count == 3
+
+    g.remove(5)
+
+    assert g._forest() is not forest
+    assert index.count == 2
+
+
+@pytest.fixture
+def dg():
+    # two cycles, 0-1-2 and 3-4, joined by 2 -> 3, plus a sink 5
+    return Digraph(range(6), {(0, 1, 4), (1, 2), (2, 0), (2, 3, 7), (1, 3, 2),
+                              (3, 4), (4, 3), (4, 5)})
+
+
+def test_strongly_connected_components(dg):
+    components = strongly_connected_components(dg)
+
+    assert [set(c) for c in components] == [{5}, {3, 4}, {0, 1, 2}]
+
+    assert [set(c) for c in strongly_connected_components(freeze(dg))] == \
+        [{5}, {3, 4}, {0, 1, 2}]
+
+
+def test_strongly_connected_components_long_path():
+    # deep enough to overflow a recursive implementation
+    n = 20000
+
+    dg = Digraph(range(n), zip(range(n - 1), range(1, n)))
+
+    assert len(strongly_connected_components(dg)) == n
+
+    dg.link(n - 1, 0)
+
+    assert len(strongly_connected_components(dg)) == 1
+    assert is_strongly_connected(dg)
+
+
+def test_condensation(dg):
+    dag, labels = condensation(dg)
+
+    assert labels == {0: 0, 1: 0, 2: 0, 3: 1, 4: 1, 5: 2}
+    assert dag.vertices == {0, 1, 2}
+    assert dag.edges == {(0, 1, 2), (1, 2, 1)}
+    assert not has_directed_cycle(dag)
+    assert not is_strongly_connected(dg)
@@ -0,0 +1,80 @@
+from math import inf
+
+import pytest
+
+from context import (CycleFound, Digraph, dag_longest_path,
+                     dag_shortest_paths, freeze, shortest_distance,
+                     topological_sort)
+
+
+@pytest.fixture
+def dag():
+    return Digraph(range(7), {(0, 1, 2), (0, 2, 6), (1, 2, 3), (1, 3, 1),
+                              (2, 4, 1), (3, 4, 8), (4, 5, 2)})
+
+
+def is_topological(g, order):
+    position = {v: i for i, v in enumerate(order)}
+
+    return len(order) == g.order and all(
+        position[v1] < position[v2] for v1, v2, _ in g.edges
+    )
+
+
+def test_topological_sort(dag):
+    assert is_topological(dag, list(topological_sort(dag)))
+    assert is_topological(dag, list(topological_sort(freeze(dag))))
+
+
+def test_topological_sort_streams():
+    g = Digraph(range(4), {(0, 1), (1, 2), (2, 1)})
+
+    order = topological_sort(g)
+
+    assert next(order) == 0
+    assert next(order) == 3
+
+    with pytest.raises(CycleFound):
+        next(order)
+
+
+def test_dag_shortest_paths(dag):
+    distance, previous = dag_shortest_paths(dag, 0)
+
+    assert distance == shortest_distance(dag, 0)
+    assert distance[6] == inf
+    assert previous[5] == 4
+    assert previous[4] == 2
+
+    distance, _ = dag_shortest_paths(dag, 1)
+
+    assert distance == {0: inf, 1: 0, 2: 3, 3: 1, 4: 4, 5: 6, 6: inf}
+
+
+def test_dag_shortest_paths_negative_weights():
+    g = Digraph(range(3), {(0, 1, 5), (0, 2, 1), (1, 2, -10)})
+
+    distance, _ = dag_shortest_paths(g, 0)
+
+    assert distance == {0: 0, 1: 5, 2: -5}
+
+
+def test_dag_longest_path(dag):
+    assert dag_longest_path(dag) == ([0, 1, 3, 4, 5], 13)
+    assert dag_longest_path(dag, 2) == ([2, 4, 5], 3)
+    assert dag_longest_path(Digraph()) == ([], 0)
+
+
+def test_dag_cached_order(dag):
+    dag.enable_cache()
+
+    assert dag_longest_path(dag).length == 13
+
+    dag.link(5, 6, 10)
+
+    assert dag_longest_path(dag) == ([0, 1, 3, 4, 5, 6], 23)
+
+    dag.link(6, 0)
+
+    with pytest.raises(CycleFound):
+        dag_shortest_paths(dag, 0)
@@ -1,6 +1,18 @@
+from random import Random
+
 import pytest
 
-from context import Graph, coloring, complete, fringe
+from context import (ColoringStrategy, Digraph, Graph, coloring, complete,
+                     fringe)
+
+STRATEGIES = (ColoringStrategy.LARGEST_FIRST, ColoringStrategy.SMALLEST_LAST,
+              ColoringStrategy.DSATUR)
+
+
+def is_proper(g, colors):
+    return colors.keys() == g.vertices and all(
+        colors[v1] != colors[v2] for v1, v2, _ in g.edges if v1 != v2
+    )
 
 
 def test_fringe():
@@ -36,21 +48,78 @@ def test_fringe_raises():
         fringe(g, [0])
 
 
-def test_coloring_complete():
+@pytest.mark.parametrize('strategy', STRATEGIES)
+def test_coloring_complete(strategy):
     for i in range(21):
         g = complete(i)
 
-        n_colors = len({c for _, c in coloring(g).items()})
+        n_colors = len({c for _, c in coloring(g, strategy).items()})
 
         assert n_colors == i
 
 
-def test_coloring_sparse():
-    assert len(coloring(Graph())) == 0
+@pytest.mark.parametrize('strategy', STRATEGIES)
+def test_coloring_sparse(strategy):
+    assert len(coloring(Graph(), strategy)) == 0
 
     for i in range(1, 21):
         g = Graph(range(i))
 
-        n_colors = len({c for _, c in coloring(g).items()})
+        n_colors = len({c for _, c in coloring(g, strategy).items()})
 
         assert n_colors == 1
+
+
+@pytest.mark.parametrize('strategy', STRATEGIES)
+def test_coloring_random(strategy):
+    random = Random(7)
+
+    g = Graph(range(300))
+
+    for _ in range(1500):
+        v1, v2 = random.randrange(300), random.randrange(300)
+
+        if not g.has_edge(v1, v2):
+            g.link(v1, v2)
+
+    colors = coloring(g, strategy)
+
+    assert is_proper(g, colors)
+    assert max(colors.values()) <= max(g.degree(v) for v in g.vertices)
+
+    dg = Digraph(range(50), {(v, (v * 7 + 1) % 50) for v in range(50)})
+
+    assert is_proper(dg, coloring(dg, strategy))
+
+
+def test_coloring_bipartite():
+    # a crown graph: largest-first can need many colors, DSATUR needs two
+    n = 10
+
+    g = Graph(range(2 * n), {(i, n + j) for i in range(n) for j in range(n)
+                             if i != j})
+
+    colors = coloring(g, ColoringStrategy.DSATUR)
+
+    assert is_proper(g, colors)
+    assert len(set(colors.values())) == 2
+
+    tree = Graph(range(15), {(i, (i - 1) // 2) for i in range(1, 15)})
+
+    for strategy in (ColoringStrategy.SMALLEST_LAST, ColoringStrategy.DSATUR):
+        assert len(set(coloring(tree, strategy).values())) == 2
+
+
+def test_coloring_dsatur_starts_from_largest_degree():
+    # every vertex starts unsaturated, so the center of the star goes first
+    star = Graph(range(6), {(5, i) for i in range(5)})
+
+    colors = coloring(star, ColoringStrategy.DSATUR)
+
+    assert colors[5] == 0
+    assert set(colors[i] for i in range(5)) == {1}
+
+
+def test_coloring_raises():
+    with pytest.raises(ValueError):
+        coloring(Graph(range(3)), 'random')
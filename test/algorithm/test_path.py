@@ -1,7 +1,14 @@
+from itertools import product
+from math import inf
+
 import pytest
 
-from context import (Graph, dijkstra, floyd_warshall, hamiltonian_cycle,
-                     shortest_distance, HamiltonianCycleNotFound)
+from context import (Digraph, Graph, all_pairs_shortest_distance, astar,
+                     bidirectional_bfs, bidirectional_dijkstra, dijkstra,
+                     euclidean, floyd_warshall, floyd_warshall_matrix,
+                     hamiltonian_cycle, lattice, load, manhattan, save,
+                     shortest_distance, shortest_paths,
+                     HamiltonianCycleNotFound, PathNotFound)
 
 
 @pytest.fixture
@@ -45,6 +52,43 @@ def test_shortest_distance(g1, g2):
     }
 
 
+@pytest.mark.parametrize('workers', [1, 2])
+def test_all_pairs_shortest_distance(g2, workers, tmp_path):
+    expected = [(v, shortest_distance(g2, v)) for v in g2.vertices]
+
+    result = all_pairs_shortest_distance(g2, workers=workers)
+
+    assert sorted(result) == sorted(expected)
+
+    # memory-mapped snapshots are copied to the workers
+    save(g2, str(tmp_path / 'g2.tndr'))
+
+    result = all_pairs_shortest_distance(load(str(tmp_path / 'g2.tndr')),
+                                         workers=workers)
+
+    assert sorted(result) == sorted(expected)
+
+
+def test_all_pairs_shortest_distance_sources():
+    dg = Digraph(range(30), zip(range(29), range(1, 30)))
+
+    result = all_pairs_shortest_distance(dg, [29, 10, 0], workers=2)
+
+    assert next(result) == (29, {v: 0 if v == 29 else inf for v in range(30)})
+
+    source, distances = next(result)
+
+    assert source == 10
+    assert distances == shortest_distance(dg, 10)
+
+    result.close()
+
+    sources = list(range(30)) * 3
+
+    assert [s for s, _ in all_pairs_shortest_distance(dg, sources, 3)] == \
+        sources
+
+
 def test_dijkstra(g2):
     assert dijkstra(g2, 0, 4) == [0, 7, 6, 5, 4]
 
@@ -53,6 +97,31 @@ def test_dijkstra(g2):
     assert dijkstra(g2, 3, 0) == [3, 2, 1, 0]
 
 
+def test_dijkstra_unreachable():
+    g = Graph(range(4), {(0, 1), (2, 3)})
+
+    assert shortest_distance(g, 0) == {0: 0, 1: 1, 2: inf, 3: inf}
+
+    with pytest.raises(PathNotFound):
+        dijkstra(g, 0, 3)
+
+
+def test_dijkstra_directed():
+    dg = Digraph(range(3), {(0, 1, 1), (1, 2, 1), (2, 0, 1)})
+
+    assert dijkstra(dg, 0, 2) == [0, 1, 2]
+
+    assert dijkstra(dg, 2, 1) == [2, 0, 1]
+
+
+def test_shortest_paths(g2):
+    assert shortest_paths(g2, 0, {4, 0, 3}) == {
+        0: [0],
+        3: [0, 1, 2, 3],
+        4: [0, 7, 6, 5, 4],
+    }
+
+
 @pytest.mark.parametrize('graph', [g1(), g2()])
 def test_floyd_warshall(graph):
     fw = floyd_warshall(graph)
@@ -84,3 +153,153 @@ def test_hamiltonian_cycle_raises():
 
     with pytest.raises(HamiltonianCycleNotFound):
         hamiltonian_cycle(g, 1)
+
+
+@pytest.mark.parametrize('name', ['g1', 'g2'])
+def test_floyd_warshall_numpy(name, request):
+    pytest.importorskip('numpy')
+
+    graph = request.getfixturevalue(name)
+
+    assert floyd_warshall(graph, use_numpy=True) == floyd_warshall(graph)
+
+
+def test_floyd_warshall_matrix(g2):
+    pytest.importorskip('numpy')
+
+    fw = floyd_warshall_matrix(g2)
+
+    for v1 in g2.vertices:
+        for v2 in g2.vertices:
+            path = fw.path(v1, v2)
+
+            assert len(path) == len(dijkstra(g2, v1, v2))
+
+            assert sum(
+                g2.weight[a, b] for a, b in zip(path, path[1:])
+            ) == fw.distance[fw.position[v1], fw.position[v2]]
+
+
+def test_floyd_warshall_matrix_unreachable():
+    pytest.importorskip('numpy')
+
+    dg = Digraph(range(3), {(0, 1, 2), (1, 2, 2)})
+
+    fw = floyd_warshall_matrix(dg)
+
+    assert fw.to_dict()[2] == {0: inf, 1: inf, 2: 0}
+
+    assert fw.path(0, 2) == [0, 1, 2]
+
+    with pytest.raises(PathNotFound):
+        fw.path(2, 0)
+
+
+def test_floyd_warshall_matrix_without_predecessors(g2):
+    pytest.importorskip('numpy')
+
+    fw = floyd_warshall_matrix(g2, predecessors=False)
+
+    assert fw.previous is None
+
+    assert fw.to_dict() == floyd_warshall(g2)
+
+    with pytest.raises(ValueError):
+        fw.path(0, 4)
+
+
+def test_astar(g2):
+    for end in g2.vertices:
+        result = astar(g2, 0, end, lambda v, end: 0)
+
+        assert len(result.path) == len(dijkstra(g2, 0, end))
+        assert result.distance == shortest_distance(g2, 0)[end]
+
+
+def test_astar_lattice():
+    g = lattice(900)
+
+    blind = astar(g, 0, 899, lambda v, end: 0)
+
+    for heuristic in (manhattan(30), euclidean(30)):
+        result = astar(g, 0, 899, heuristic)
+
+        assert result.distance == blind.distance == 58
+        assert len(result.path) == 59
+        assert result.expanded < blind.expanded
+
+
+def test_astar_coordinates():
+    g = Graph(
+        product(range(5), range(5)),
+        {((x, y), (x + 1, y)) for x in range(4) for y in range(5)} |
+        {((x, y), (x, y + 1)) for x in range(5) for y in range(4)},
+    )
+
+    assert manhattan()((0, 0), (3, 4)) == 7
+    assert euclidean()((0, 0), (3, 4)) == 5
+
+    result = astar(g, (0, 0), (4, 4), manhattan())
+
+    assert result.distance == 8
+    assert result.path[0] == (0, 0)
+    assert result.path[-1] == (4, 4)
+
+
+def test_astar_unreachable():
+    g = Graph(range(4), {(0, 1), (2, 3)})
+
+    with pytest.raises(PathNotFound):
+        astar(g, 0, 3, manhattan(2))
+
+
+def path_weight(g, path):
+    return sum(g.weight[a, b] for a, b in zip(path, path[1:]))
+
+
+def test_bidirectional_dijkstra(g1, g2):
+    for g in (g1, g2):
+        for v1 in g.vertices:
+            distance = shortest_distance(g, v1)
+
+            for v2 in g.vertices:
+                path = bidirectional_dijkstra(g, v1, v2)
+
+                assert path[0] == v1
+                assert path[-1] == v2
+                assert path_weight(g, path) == distance[v2]
+
+
+def test_bidirectional_bfs():
+    g = lattice(100)
+
+    for v1, v2 in [(0, 99), (0, 0), (45, 54), (9, 90), (37, 38)]:
+        path = bidirectional_bfs(g, v1, v2)
+
+        assert path[0] == v1
+        assert path[-1] == v2
+        assert len(path) == len(dijkstra(g, v1, v2))
+
+        for a, b in zip(path, path[1:]):
+            assert g.has_edge(a, b)
+
+
+def test_bidirectional_directed():
+    dg = Digraph(range(5), {(0, 1, 1), (1, 2, 1), (2, 3, 1), (3, 4, 1),
+                            (4, 0, 1), (0, 3, 5)})
+
+    assert bidirectional_bfs(dg, 0, 4) == [0, 3, 4]
+    assert bidirectional_bfs(dg, 4, 3) == [4, 0, 3]
+
+    assert bidirectional_dijkstra(dg, 0, 4) == [0, 1, 2, 3, 4]
+    assert bidirectional_dijkstra(dg, 3, 2) == [3, 4, 0, 1, 2]
+
+
+def test_bidirectional_unreachable():
+    g = Graph(range(4), {(0, 1), (2, 3)})
+
+    with pytest.raises(PathNotFound):
+        bidirectional_bfs(g, 0, 3)
+
+    with pytest.raises(PathNotFound):
+        bidirectional_dijkstra(g, 0, 3)
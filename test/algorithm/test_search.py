@@ -1,4 +1,5 @@
-from context import Graph, bfs, dfs
+from context import (Digraph, Graph, bfs, binary_tree, dfs, dfs_postorder,
+                     dfs_preorder, iter_bfs, iter_dfs, lattice)
 
 
 def test_dfs():
@@ -21,3 +22,75 @@ def test_bfs():
         assert r == i
 
     assert bfs(g, 0, lambda v: False) is None
+
+
+def test_dfs_order():
+    g = binary_tree(7)
+
+    assert list(dfs_preorder(g, 0)) == [0, 1, 3, 4, 2, 5, 6]
+
+    assert list(dfs_postorder(g, 0)) == [3, 4, 1, 5, 6, 2, 0]
+
+
+def test_dfs_long_path():
+    n = 20000
+
+    g = lattice(n, width=1)
+
+    assert dfs(g, 0, lambda v: v == n - 1) == n - 1
+
+    assert sum(1 for _ in dfs_preorder(g, 0)) == n
+
+    assert next(dfs_postorder(g, 0)) == n - 1
+
+
+def test_iter_bfs():
+    g = binary_tree(7)
+
+    assert list(iter_bfs(g, 0)) == [
+        (0, 0, None),
+        (1, 1, 0), (2, 1, 0),
+        (3, 2, 1), (4, 2, 1), (5, 2, 2), (6, 2, 2),
+    ]
+
+    assert [v for v, _, _ in iter_bfs(g, 1, max_depth=1)] == [1, 0, 3, 4]
+
+    assert [v for v, _, _ in iter_bfs(g, 0, follow=lambda v, n: n != 2)] \
+        == [0, 1, 3, 4]
+
+
+def test_iter_dfs():
+    g = binary_tree(7)
+
+    assert list(iter_dfs(g, 0)) == [
+        (0, 0, None),
+        (1, 1, 0), (3, 2, 1), (4, 2, 1),
+        (2, 1, 0), (5, 2, 2), (6, 2, 2),
+    ]
+
+    assert [v for v, _, _ in iter_dfs(g, 0, max_depth=1)] == [0, 1, 2]
+
+    assert [v for v, _, _ in iter_dfs(g, 0, follow=lambda v, n: n != 1)] \
+        == [0, 2, 5, 6]
+
+
+def test_iter_dfs_max_depth_shorter_path():
+    # c is two steps away through b, but three through a
+    g = Digraph('sabc', {('s', 'a'), ('a', 'b'), ('b', 'c'), ('s', 'b')})
+
+    visits = list(iter_dfs(g, 's', max_depth=2))
+
+    assert sorted(v for v, _, _ in visits) == ['a', 'b', 'c', 's']
+    assert {v for v, _, _ in visits} == \
+        {v for v, _, _ in iter_bfs(g, 's', max_depth=2)}
+    assert ('c', 2, 'b') in visits
+
+
+def test_iter_lazy():
+    g = lattice(20000, width=1)
+
+    visits = iter_bfs(g, 0)
+
+    assert [next(visits) for _ in range(3)] == [
+        (0, 0, None), (1, 1, 0), (2, 2, 1),
+    ]
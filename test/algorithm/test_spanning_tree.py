@@ -54,3 +54,40 @@ def test_kruskal_raises():
 
     with pytest.raises(ValueError):
         kruskal(g)
+
+
+def test_kruskal_forest():
+    g = Graph(range(6), {(0, 1, 3), (1, 2, 1), (0, 2, 2), (3, 4, 7)})
+
+    forest = kruskal(g)
+
+    assert forest.vertices == set(range(6))
+
+    assert forest.edges == {(1, 2, 1), (0, 2, 2), (3, 4, 7)}
+
+
+def test_kruskal_long_path():
+    n = 5000
+
+    g = Graph(range(n), zip(range(n - 1), range(1, n)))
+
+    assert len(kruskal(g).edges) == n - 1
+
+
+def test_prim_forest():
+    g = Graph(range(6), {(0, 1, 3), (1, 2, 1), (0, 2, 2), (3, 4, 7)})
+
+    for start in range(6):
+        forest = prim(g, start)
+
+        assert forest.vertices == set(range(6))
+
+        assert forest.edges == {(1, 2, 1), (0, 2, 2), (3, 4, 7)}
+
+
+def test_prim_long_path():
+    n = 5000
+
+    g = Graph(range(n), zip(range(n - 1), range(1, n)))
+
+    assert len(prim(g, n // 2).edges) == n - 1
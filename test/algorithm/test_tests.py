@@ -1,7 +1,8 @@
 import pytest
 
-from context import (Graph, has_cycle, is_complete, is_connected, is_regular,
-                     is_tree, transitive_closure)
+from context import (Digraph, Graph, has_cycle, has_directed_cycle,
+                     is_complete, is_connected, is_regular, is_tree, lattice,
+                     transitive_closure)
 
 MAX = 100
 
@@ -122,3 +123,102 @@ def test_transitive_closure(g):
 
     for i in range(MAX):
         assert transitive_closure(g, i) == g.vertices
+
+
+def test_long_path():
+    n = 20000
+
+    g = lattice(n, width=1)
+
+    assert transitive_closure(g, n // 2) == g.vertices
+
+    assert is_connected(g)
+
+    assert is_tree(g)
+
+    assert not has_cycle(g)
+
+
+def test_cycle_other_component(g):
+    for i in range(MAX - 1):
+        g.link(i, i + 1)
+
+    g.insert(MAX)
+    g.insert(MAX + 1)
+    g.insert(MAX + 2)
+
+    assert not has_cycle(g)
+
+    g.link(MAX, MAX + 1)
+    g.link(MAX + 1, MAX + 2)
+    g.link(MAX + 2, MAX)
+
+    assert has_cycle(g)
+    assert not is_tree(g)
+
+
+def test_cycle_loop(g):
+    assert not has_cycle(g)
+
+    g.link(0, 0)
+
+    assert has_cycle(g)
+
+
+def test_tree_forest(g):
+    for i in range(1, MAX - 1):
+        g.link(i, i + 1)
+
+    assert not has_cycle(g)
+    assert not is_tree(g)
+
+    g.link(0, 1)
+
+    assert is_tree(g)
+
+
+def test_directed_cycle():
+    dg = Digraph(range(MAX))
+
+    assert not has_directed_cycle(dg)
+
+    for i in range(MAX - 1):
+        dg.link(i, i + 1)
+
+    for i in range(0, MAX, 3):
+        if i + 2 < MAX:
+            dg.link(i, i + 2)
+
+    assert not has_directed_cycle(dg)
+
+    dg.link(MAX - 1, MAX // 2)
+
+    assert has_directed_cycle(dg)
+
+    dg.unlink(MAX - 1, MAX // 2)
+    dg.link(MAX - 1, MAX - 1)
+
+    assert has_directed_cycle(dg)
+
+
+def test_cached_tests(g):
+    g.enable_cache()
+
+    for v in range(MAX - 1):
+        g.link(v, v + 1)
+
+    assert is_tree(g)
+    assert is_connected(g)
+    assert not is_regular(g)
+
+    g.link(0, MAX - 1)
+
+    assert not is_tree(g)
+    assert is_regular(g)
+    assert has_cycle(g)
+
+    g.unlink(0, 1)
+    g.unlink(0, MAX - 1)
+
+    assert not is_connected(g)
+    assert not has_cycle(g)
@@ -0,0 +1,143 @@
+import pickle
+
+import pytest
+
+from context import (CSRGraph, Digraph, Graph, bfs, coloring, dfs, dijkstra,
+                     freeze, lattice, prim, shortest_distance,
+                     transitive_closure)
+
+
+@pytest.fixture
+def g():
+    return Graph(range(6), {(0, 1, 3), (1, 2), (2, 3, 4), (3, 0), (4, 4, 2)})
+
+
+@pytest.fixture
+def dg():
+    return Digraph(range(4), {(0, 1, 3), (1, 2), (2, 0, 4), (0, 2)})
+
+
+def test_freeze_graph(g):
+    csr = freeze(g)
+
+    assert isinstance(csr, CSRGraph)
+    assert not csr.directed
+
+    assert csr.order == g.order
+    assert csr.vertices == g.vertices
+    assert csr.edges == g.edges
+
+    for v in g.vertices:
+        assert csr.neighbors(v) == g.neighbors(v)
+        assert csr.degree(v) == g.degree(v)
+
+        for w in g.vertices:
+            assert csr.has_edge(v, w) == g.has_edge(v, w)
+
+
+def test_freeze_digraph(dg):
+    csr = freeze(dg)
+
+    assert csr.directed
+
+    assert csr.edges == dg.edges
+
+    for v in dg.vertices:
+        assert csr.successors(v) == dg.successors(v)
+        assert csr.predecessors(v) == dg.predecessors(v)
+        assert csr.neighbors(v) == dg.neighbors(v)
+        assert csr.indegree(v) == dg.indegree(v)
+        assert csr.outdegree(v) == dg.outdegree(v)
+
+
+def test_weight(dg):
+    csr = freeze(dg)
+
+    assert csr.weight[0, 1] == 3
+    assert csr.weight[2, 0] == 4
+
+    with pytest.raises(KeyError):
+        csr.weight[1, 0]
+
+    with pytest.raises(TypeError):
+        csr.weight[0, 1] = 5
+
+
+def test_float_weights():
+    csr = freeze(Graph(range(3), {(0, 1, 1), (1, 2, 0.5)}))
+
+    assert csr.weight[0, 1] == 1
+    assert csr.weight[2, 1] == 0.5
+
+
+def test_huge_weights():
+    g = Digraph(range(3), {(0, 1, 1), (1, 2, 2 ** 70)})
+
+    csr = freeze(g)
+
+    assert csr.weight[0, 1] == 1
+    assert csr.weight[1, 2] == 2 ** 70
+    assert csr.thaw() == g
+
+    g = Digraph(range(3), {(0, 1, 1.5), (1, 2, 2 ** 70 + 1)})
+
+    csr = freeze(g)
+
+    assert csr.weight[0, 1] == 1.5
+    assert csr.weight[1, 2] == 2 ** 70 + 1
+    assert csr.thaw() == g
+
+
+def test_thaw(g, dg):
+    assert freeze(g).thaw() == g
+    assert freeze(dg).thaw() == dg
+
+
+def test_algorithms():
+    g = lattice(25)
+    csr = freeze(g)
+
+    assert transitive_closure(csr, 0) == transitive_closure(g, 0)
+    assert bfs(csr, 0, lambda v: v == 24) == 24
+    assert dfs(csr, 0, lambda v: v == 24) == 24
+    assert shortest_distance(csr, 0) == shortest_distance(g, 0)
+    assert len(dijkstra(csr, 0, 24)) == len(dijkstra(g, 0, 24))
+    assert len(prim(csr).edges) == g.order - 1
+
+    colors = coloring(csr)
+
+    for v1, v2, _ in g.edges:
+        assert colors[v1] != colors[v2]
+
+
+def test_views(g, dg):
+    csr = freeze(g)
+
+    assert set(csr.vertex_view()) == g.vertices
+
+    for v in g.vertices:
+        assert set(csr.iter_neighbors(v)) == g.neighbors(v)
+        assert set(csr.weighted_successors(v)) == \
+            set(g.weighted_successors(v))
+
+    csr = freeze(dg)
+
+    for v in dg.vertices:
+        assert sorted(csr.iter_neighbors(v)) == sorted(dg.neighbors(v))
+        assert set(csr.iter_predecessors(v)) == dg.predecessors(v)
+        assert set(csr.weighted_predecessors(v)) == \
+            set(dg.weighted_predecessors(v))
+
+    assert (1, 3) in csr.weighted_successors(0)
+    assert (1, 4) not in csr.weighted_successors(0)
+
+
+def test_pickle(g, dg):
+    for graph in (g, dg):
+        frozen = freeze(graph)
+
+        copy = pickle.loads(pickle.dumps(frozen))
+
+        assert copy.directed == frozen.directed
+        assert copy.vertices == frozen.vertices
+        assert copy.edges == frozen.edges
@@ -1,6 +1,6 @@
 import pytest
 
-from context import Digraph
+from context import Digraph, is_connected
 from itertools import repeat
 
 
@@ -51,6 +51,16 @@ def test_link_raises(dg):
         dg.link(0, 1)
 
 
+def test_link_missing_vertex(dg):
+    for v1, v2 in [(0, 42), (42, 0)]:
+        with pytest.raises(KeyError):
+            dg.link(v1, v2)
+
+    assert dg.size == 0
+    assert dg.edges == set()
+    assert all(dg.outdegree(v) == 0 for v in dg.vertices)
+
+
 def test_unlink(dg):
     for v in dg.vertices:
         for w in dg.vertices - {v}:
@@ -95,3 +105,192 @@ def test_neighbors(dg):
     for v in dg.vertices:
         assert dg.neighbors(v) == set()
         assert dg.degree(v) == 0
+
+
+def test_predecessors_after_unlink(dg):
+    edges = knot(dg)
+
+    for v, w in edges:
+        dg.unlink(v, w)
+
+        assert dg.predecessors(w) == set()
+        assert dg.indegree(w) == 0
+
+
+def test_remove_updates_predecessors(dg):
+    for v in range(1, 10):
+        dg.link(0, v)
+        dg.link(v, 0)
+
+    dg.remove(0)
+
+    for v in range(1, 10):
+        assert dg.predecessors(v) == set()
+        assert dg.successors(v) == set()
+        assert dg.degree(v) == 0
+
+
+def test_set_weight_updates_predecessors(dg):
+    dg.link(0, 1, 5)
+
+    dg.weight[0, 1] = 7
+
+    assert dg.weight[0, 1] == 7
+    assert dg._predecessors[1] == {0: 7}
+
+
+def test_views(dg):
+    vertices = dg.vertex_view()
+
+    assert set(vertices) == set(range(10))
+
+    dg.link(0, 1, 3)
+    dg.link(2, 0, 4)
+
+    assert set(dg.iter_successors(0)) == {1}
+    assert set(dg.iter_predecessors(0)) == {2}
+    assert sorted(dg.iter_neighbors(0)) == [1, 2]
+    assert set(dg.weighted_successors(0)) == {(1, 3)}
+    assert set(dg.weighted_predecessors(0)) == {(2, 4)}
+
+    dg.link(1, 0)
+
+    assert sorted(dg.iter_neighbors(0)) == [1, 2]
+
+    dg.insert(10)
+
+    assert 10 in vertices
+
+
+def test_from_edges():
+    dg = Digraph.from_edges([(0, 1), (1, 0, 3), (1, 2)])
+
+    assert isinstance(dg, Digraph)
+    assert dg.edges == {(0, 1, 1), (1, 0, 3), (1, 2, 1)}
+    assert dg.predecessors(0) == {1}
+    assert dg.predecessors(2) == {1}
+
+    with pytest.raises(ValueError):
+        dg.add_edges_from([(0, 1)])
+
+    dg.add_edges_from([(0, 1, 9)], strict=False)
+
+    assert dg.weight[0, 1] == 9
+    assert dg._predecessors[1][0] == 9
+
+
+def test_version_and_size(dg):
+    version = dg.version
+
+    dg.link(0, 1)
+    dg.link(1, 0, 2)
+    dg.link(2, 2)
+
+    assert dg.size == 3
+    assert dg.version > version
+
+    version = dg.version
+    dg.weight[0, 1] = 5
+
+    assert dg.version > version
+
+    dg.remove(1)
+
+    assert dg.size == 1
+
+    dg.add_edges_from([(2, 3), (2, 3)], strict=False)
+
+    assert dg.size == 2
+
+
+def test_cache(dg):
+    def histogram():
+        counts = {}
+
+        for v in dg.vertices:
+            counts[dg.degree(v)] = counts.get(dg.degree(v), 0) + 1
+
+        return counts
+
+    dg.enable_cache()
+
+    assert dg.degree_histogram() == {0: 10}
+    assert dg.count_components() == 10
+
+    for v1, v2 in [(0, 1), (1, 0), (1, 2), (3, 3), (4, 2), (2, 4)]:
+        dg.link(v1, v2)
+
+        assert dg.degree_histogram() == histogram()
+
+    assert dg.count_components() == 7
+
+    dg.insert(10)
+    dg.unlink(1, 2)
+
+    assert dg.degree_histogram() == histogram()
+    assert dg.count_components() == 9
+
+    dg.remove(4)
+
+    assert dg.degree_histogram() == histogram()
+    assert dg.count_components() == 9
+
+    first = dg.cached('key', object)
+
+    assert dg.cached('key', object) is first
+    assert dg.edges == {(0, 1, 1), (1, 0, 1), (3, 3, 1)}
+
+    dg.link(0, 3)
+
+    assert dg.cached('key', object) is not first
+    assert dg.edges == {(0, 1, 1), (1, 0, 1), (3, 3, 1), (0, 3, 1)}
+
+    dg.disable_cache()
+
+    assert dg.cached('key', object) is not dg.cached('key', object)
+
+
+def test_cache_remove_isolated():
+    dg = Digraph(range(3), {(0, 1)})
+
+    dg.enable_cache()
+
+    assert dg.count_components() == 2
+    assert not is_connected(dg)
+
+    dg.remove(2)
+
+    assert dg.count_components() == 1
+    assert is_connected(dg)
+
+
+def test_cache_hub():
+    # each link moves the hub between histogram buckets in O(1), so this
+    # stays linear in the number of edges
+    n = 40000
+
+    dg = Digraph(range(n + 1))
+
+    dg.enable_cache()
+    dg.degree_histogram()
+
+    for v in range(1, n + 1):
+        dg.link(0, v)
+
+    for v in range(1, n + 1, 2):
+        dg.link(v, 0)
+
+    assert dg.degree_histogram() == {n: 1, 1: n}
+
+    for v in range(1, n + 1, 4):
+        dg.unlink(0, v)
+
+    assert dg.degree_histogram() == {n: 1, 1: n}
+
+    dg.link(0, 0)
+
+    assert dg.degree_histogram() == {n + 1: 1, 1: n}
+
+    dg.remove(0)
+
+    assert dg.degree_histogram() == {0: n}
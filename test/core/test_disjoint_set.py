@@ -0,0 +1,60 @@
+from context import DisjointSet
+
+
+def test_init():
+    ds = DisjointSet(range(10))
+
+    assert len(ds) == 10
+    assert ds.count == 10
+
+    for i in range(10):
+        assert i in ds
+        assert ds.find(i) == i
+
+    assert 10 not in ds
+
+
+def test_add():
+    ds = DisjointSet()
+
+    ds.add(0)
+    ds.add(0)
+
+    assert len(ds) == 1
+    assert ds.count == 1
+
+
+def test_union():
+    ds = DisjointSet(range(10))
+
+    for i in range(0, 10, 2):
+        assert ds.union(i, i + 1)
+
+    assert ds.count == 5
+
+    for i in range(0, 10, 2):
+        assert ds.connected(i, i + 1)
+        assert not ds.connected(i, (i + 2) % 10)
+
+    assert not ds.union(1, 0)
+
+    for i in range(0, 8, 2):
+        ds.union(i, i + 2)
+
+    assert ds.count == 1
+
+    root = ds.find(0)
+
+    assert all(ds.find(i) == root for i in range(10))
+
+
+def test_long_chain():
+    n = 100000
+
+    ds = DisjointSet(range(n))
+
+    for i in range(n - 1):
+        ds.union(i, i + 1)
+
+    assert ds.count == 1
+    assert ds.connected(0, n - 1)
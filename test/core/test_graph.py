@@ -1,6 +1,8 @@
+from array import array
+
 import pytest
 
-from context import Graph
+from context import Graph, has_cycle, is_connected, is_tree
 
 MAX = 100
 
@@ -182,3 +184,110 @@ def test_str(g):
     g.link(0, 1, 5)
 
     assert str(g) == 'Graph({0, 1}, {(0, 1, 5)})'
+
+
+def test_views(g):
+    neighbors = g.iter_neighbors(0)
+
+    assert len(neighbors) == 0
+
+    g.link(0, 1, 5)
+    g.link(2, 0)
+
+    assert set(neighbors) == {1, 2}
+    assert set(g.weighted_successors(0)) == {(1, 5), (2, 1)}
+    assert len(g.vertex_view()) == MAX
+
+
+def test_from_edges():
+    g = Graph.from_edges([(0, 1), (1, 2, 5), (3, 3)], vertices=[4])
+
+    assert isinstance(g, Graph)
+    assert g.vertices == {0, 1, 2, 3, 4}
+    assert g.edges == {(0, 1, 1), (1, 2, 5), (3, 3, 1)}
+
+
+def test_add_edges_from_strict(g):
+    g.add_edges_from([(0, 1), (1, 2)])
+
+    with pytest.raises(ValueError):
+        g.add_edges_from([(2, 3), (1, 0)])
+
+    g.add_edges_from([(2, 1, 7), (0, 1, 3)], strict=False)
+
+    assert g.edges == {(0, 1, 3), (1, 2, 7), (2, 3, 1)}
+    assert g.weight[2, 1] == g.weight[1, 2] == 7
+
+
+def test_add_edge_columns(g):
+    g.add_edge_columns(array('l', [0, 1]), array('l', [1, 2]))
+    g.add_edge_columns(array('l', [2]), array('l', [3]), array('d', [0.5]))
+
+    assert g.edges == {(0, 1, 1), (1, 2, 1), (2, 3, 0.5)}
+
+
+def test_add_edges_from_numpy():
+    np = pytest.importorskip('numpy')
+
+    g = Graph.from_edges(np.array([[0, 1, 4], [1, 2, 5]]))
+
+    assert g.edges == {(0, 1, 4), (1, 2, 5)}
+
+    for v1, v2, w in g.edges:
+        assert type(v1) is type(v2) is type(w) is int
+
+
+def test_add_edge_columns_numpy():
+    np = pytest.importorskip('numpy')
+
+    g = Graph()
+
+    g.add_edge_columns(np.array([0, 1]), np.array([1, 2]), np.array([4, 5]))
+    g.add_edge_columns(np.array([2]), np.array([3]))
+
+    assert g.edges == {(0, 1, 4), (1, 2, 5), (2, 3, 1)}
+
+    for v1, v2, w in g.edges:
+        assert type(v1) is type(v2) is type(w) is int
+
+
+def test_cache(g):
+    g = Graph(range(5))
+
+    g.enable_cache()
+
+    g.link(0, 1)
+    g.link(1, 1)
+    g.link(2, 3)
+
+    assert g.size == 3
+    assert g.degree_histogram() == {0: 1, 1: 3, 2: 1}
+    assert g.count_components() == 3
+
+    g.unlink(1, 1)
+
+    assert g.size == 2
+    assert g.degree_histogram() == {0: 1, 1: 4}
+
+    g.remove(0)
+
+    assert g.size == 1
+    assert g.degree_histogram() == {0: 2, 1: 2}
+    assert g.count_components() == 3
+    assert g.edges == {(2, 3, 1)}
+
+
+def test_cache_remove_isolated():
+    g = Graph(range(3), {(0, 1)})
+
+    g.enable_cache()
+
+    assert g.count_components() == 2
+    assert not is_tree(g)
+
+    g.remove(2)
+
+    assert g.count_components() == 1
+    assert is_tree(g)
+    assert is_connected(g)
+    assert not has_cycle(g)
@@ -0,0 +1,140 @@
+import pytest
+
+from context import (ImplicitGraph, astar, bfs, dfs, dijkstra, iter_bfs,
+                     iter_dfs, manhattan, shortest_paths)
+
+
+def grid(v):
+    """
+    Successors on an infinite grid
+    """
+    x, y = v
+
+    return ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1))
+
+
+def test_successors():
+    g = ImplicitGraph(grid)
+
+    assert set(g.iter_successors((0, 0))) == {(1, 0), (-1, 0), (0, 1), (0, -1)}
+    assert set(g.iter_neighbors((0, 0))) == set(g.iter_successors((0, 0)))
+    assert set(g.weighted_successors((0, 0))) == {
+        ((1, 0), 1), ((-1, 0), 1), ((0, 1), 1), ((0, -1), 1),
+    }
+
+    assert g.has_edge((0, 0), (1, 0))
+    assert not g.has_edge((0, 0), (1, 1))
+    assert g.outdegree((5, 5)) == 4
+
+
+def test_weighted():
+    g = ImplicitGraph(lambda v: [(v + 1, 2), (v * 2, 3)], weighted=True)
+
+    assert g.weight[3, 4] == 2
+    assert g.weight[3, 6] == 3
+
+    with pytest.raises(KeyError):
+        g.weight[3, 5]
+
+    with pytest.raises(TypeError):
+        g.weight[3, 4] = 1
+
+    assert dijkstra(g, 1, 10) == [1, 2, 4, 5, 10]
+
+
+def test_search():
+    g = ImplicitGraph(grid)
+
+    assert bfs(g, (0, 0), lambda v: v == (3, 2)) == (3, 2)
+    assert dfs(g, (0, 0), lambda v: v == (3, 0)) == (3, 0)
+
+    visits = list(iter_dfs(g, (0, 0), max_depth=2))
+
+    assert [v for v, _, _ in visits] == [
+        (0, 0), (1, 0), (2, 0), (1, 1), (1, -1), (-1, 0), (-2, 0), (-1, 1),
+        (-1, -1), (0, 1), (0, 2), (0, -1), (0, -2),
+    ]
+
+    for v, depth, parent in visits[1:]:
+        assert depth <= 2
+        assert g.has_edge(parent, v)
+
+    assert len(dijkstra(g, (0, 0), (3, 2))) == 6
+
+    assert [v for v, _, _ in iter_bfs(g, (0, 0), max_depth=1)] == [
+        (0, 0), (1, 0), (-1, 0), (0, 1), (0, -1),
+    ]
+
+    paths = shortest_paths(g, (0, 0), {(1, 1), (-2, 0)})
+
+    assert len(paths[1, 1]) == 3
+    assert len(paths[-2, 0]) == 3
+
+
+def test_astar():
+    g = ImplicitGraph(grid)
+
+    result = astar(g, (0, 0), (20, 30), manhattan())
+
+    assert result.distance == 50
+    assert result.expanded == 50
+
+
+def test_cache_size():
+    expanded = []
+
+    def successors(v):
+        expanded.append(v)
+
+        return grid(v)
+
+    g = ImplicitGraph(successors, cache_size=2)
+
+    g.iter_successors((0, 0))
+    g.iter_successors((1, 0))
+    g.iter_successors((0, 0))
+
+    assert expanded == [(0, 0), (1, 0)]
+
+    g.iter_successors((2, 0))
+    g.iter_successors((0, 0))
+
+    assert expanded == [(0, 0), (1, 0), (2, 0)]
+
+    g.iter_successors((1, 0))
+
+    assert expanded == [(0, 0), (1, 0), (2, 0), (1, 0)]
+
+
+def test_default_cache_is_bounded():
+    g = ImplicitGraph(grid)
+
+    for x in range(2000):
+        g.iter_successors((x, 0))
+
+    assert len(g._cache) == 1024
+
+
+def test_unbounded_cache():
+    g = ImplicitGraph(grid, cache_size=None)
+
+    for x in range(2000):
+        g.iter_successors((x, 0))
+
+    assert len(g._cache) == 2000
+
+
+def test_no_cache():
+    expanded = []
+
+    def successors(v):
+        expanded.append(v)
+
+        return grid(v)
+
+    g = ImplicitGraph(successors, cache_size=0)
+
+    g.iter_successors((0, 0))
+    g.iter_successors((0, 0))
+
+    assert expanded == [(0, 0), (0, 0)]
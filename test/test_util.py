@@ -1,31 +1,39 @@
-from subprocess import PIPE, run
+import asyncio
+import gzip
+import sys
+from io import StringIO
+from subprocess import PIPE, CalledProcessError, run
 from tempfile import NamedTemporaryFile
 
 import pytest
 
-from context import Graph, export_dot, export_png, is_complete, to_dot
+from context import (CSRGraph, Digraph, Graph, Filter, export_dot,
+                     export_many, export_png, export_png_async, freeze,
+                     is_complete, iter_dot, lattice, load, read_adjlist,
+                     read_dot, read_edgelist, save, shortest_distance,
+                     to_dot, write_adjlist, write_dot, write_edgelist)
 
-g_dot1 = 'graph {\n"1" -- "2";\n"0" -- "1";\n"5" -- "6";\n' \
-    '"6" -- "7";\n"8" -- "9";\n"3" -- "4";\n"7" -- "8";\n"4" -- "5";' \
-    '\n"2" -- "3";\n}'
+g_dot1 = 'graph {\n"0" -- "1";\n"1" -- "2";\n"2" -- "3";\n' \
+    '"3" -- "4";\n"4" -- "5";\n"5" -- "6";\n"6" -- "7";\n"7" -- "8";' \
+    '\n"8" -- "9";\n}'
 
-g_dot2 = 'graph {\n"1" -- "2";\n"0" -- "1";\n"5" -- "6";\n' \
-         '"6" -- "7";\n"3" -- "4";\n"7" -- "8";\n"4" -- "5";\n' \
-         '"2" -- "3";\n"9";\n}'
+g_dot2 = 'graph {\n"0" -- "1";\n"1" -- "2";\n"2" -- "3";\n' \
+         '"3" -- "4";\n"4" -- "5";\n"5" -- "6";\n"6" -- "7";\n' \
+         '"7" -- "8";\n"9";\n}'
 
 g_dot_weighted = '''
-graph {\n"2" -- "3" [label="5"];\
-\n"7" -- "8" [label="5"];\n"8" -- "9" [label="5"];\
-\n"6" -- "7" [label="5"];\n"4" -- "5" [label="5"];\
-\n"5" -- "6" [label="5"];\n"3" -- "4" [label="5"];\
-\n"1" -- "2" [label="5"];\n"0" -- "1" [label="5"];\n}
+graph {\n"0" -- "1" [label="5"];\
+\n"1" -- "2" [label="5"];\n"2" -- "3" [label="5"];\
+\n"3" -- "4" [label="5"];\n"4" -- "5" [label="5"];\
+\n"5" -- "6" [label="5"];\n"6" -- "7" [label="5"];\
+\n"7" -- "8" [label="5"];\n"8" -- "9" [label="5"];\n}
 '''.strip()
 
 g_dot_color = '''
-graph {\n"1" -- "2";\n"0" -- "1";\n"5" -- "6" [color="red"];\
-\n"6" -- "7" [color="red"];\n"8" -- "9" [color="red"];\n\
-"3" -- "4" [color="red"];\n"7" -- "8" [color="red"];\n\
-"4" -- "5" [color="red"];\n"2" -- "3";\n}
+graph {\n"0" -- "1";\n"1" -- "2";\n"2" -- "3";\
+\n"3" -- "4" [color="red"];\n"4" -- "5" [color="red"];\n\
+"5" -- "6" [color="red"];\n"6" -- "7" [color="red"];\n\
+"7" -- "8" [color="red"];\n"8" -- "9" [color="red"];\n}
 '''.strip()
 
 
@@ -77,6 +85,119 @@ def test_export_dot(g):
         assert file.read().decode('utf-8') == g_dot2
 
 
+def test_digraph_dot():
+    dg = Digraph(range(4), {(0, 1), (1, 0, 2)})
+
+    assert to_dot(dg) == \
+        'digraph {\n"0" -> "1";\n"1" -> "0" [label="2"];\n"2";\n"3";\n}'
+
+    g = read_dot(StringIO(to_dot(dg)), vertex_type=int)
+
+    assert type(g) is Digraph
+    assert g == dg
+
+
+def test_dot_unorderable_vertices():
+    # vertices are never compared, so mixed types are fine
+    g = Graph([None], [(1, 'a'), ('a', (2, 3)), ((2, 3), 1)])
+
+    assert to_dot(g) == 'graph {\n"1" -- "a";\n"1" -- "(2, 3)";\n' \
+        '"a" -- "(2, 3)";\n"None";\n}'
+
+    dg = freeze(Digraph(edges=[(1, 'a'), ('a', 1)]))
+
+    assert to_dot(dg) == 'digraph {\n"1" -> "a";\n"a" -> "1";\n}'
+
+
+def test_iter_dot(g):
+    chunks = list(iter_dot(g))
+
+    assert chunks[0] == 'graph {\n'
+    assert chunks[-1] == '}'
+    assert ''.join(chunks) == g_dot1
+
+
+def test_write_dot_stream(g):
+    file = StringIO()
+
+    write_dot(g, file, force_weight=True)
+
+    assert file.getvalue() == to_dot(g, force_weight=True)
+
+
+def test_read_dot_round_trip(weighted):
+    file = StringIO()
+
+    write_dot(weighted, file)
+    file.seek(0)
+
+    g = read_dot(file, vertex_type=int)
+
+    assert type(g) is Graph
+    assert g == weighted
+
+    g.unlink(3, 4)
+
+    assert read_dot(StringIO(to_dot(g)), vertex_type=int) == g
+
+    # quotes and backslashes, including one right before the closing quote
+    g = Graph(['a\\', 'b"c', 'd\\"e\\\\'], [('a\\', 'b"c')])
+
+    assert read_dot(StringIO(to_dot(g))) == g
+
+
+def test_read_dot_syntax():
+    source = '''
+    /* a comment
+       spanning lines */
+    strict digraph "name" {
+        graph [rankdir=LR];
+        node [shape=circle]
+        label = "ignored"
+        a -> b -> "c d" [label=3, color=red];
+        // c d is a single vertex
+        "c d":n -> a [label="2"] [weight=9]
+        "say \\"hi\\""; lonely
+    }
+    '''
+
+    g = read_dot(StringIO(source))
+
+    assert type(g) is Digraph
+    assert g.vertices == {'a', 'b', 'c d', 'say "hi"', 'lonely'}
+    assert g.edges == {('a', 'b', 3), ('b', 'c d', 3), ('c d', 'a', 2)}
+
+
+def test_read_dot_node_labels():
+    g = read_dot(StringIO('graph { a [label="Alice"]; a -- b [label=2] }'))
+
+    assert g.vertices == {'a', 'b'}
+    assert g.edges == {('a', 'b', 2)}
+
+
+def test_read_dot_float_weights():
+    g = Graph(range(3), {(0, 1, 2.5), (1, 2, 3)})
+
+    loaded = read_dot(StringIO(to_dot(g)), vertex_type=int)
+
+    assert loaded == g
+    assert type(loaded.weight[1, 2]) is int
+
+
+def test_read_dot_errors():
+    with pytest.raises(ValueError):
+        read_dot(StringIO('graph { a -> b }'))
+
+    with pytest.raises(ValueError):
+        read_dot(StringIO('digraph { subgraph { a } }'))
+
+    with pytest.raises(ValueError):
+        read_dot(StringIO('graph { a -- "b }'))
+
+    with pytest.raises(ValueError):
+        read_dot(StringIO('tree { a }'))
+
+
 def test_export_png(g):
     with NamedTemporaryFile() as file:
         export_png(g, file.name)
@@ -101,3 +222,264 @@ def test_export_png(g):
         export_png(g, file.name)
 
         assert is_png(file.name)
+
+
+FAKE_GRAPHVIZ = f'''#!{sys.executable}
+import os.path
+import sys
+
+dot = sys.stdin.read()
+
+sys.stdout.write(os.path.basename(sys.argv[0]) + ' ' + sys.argv[1] + '\\n')
+sys.stdout.write(dot)
+'''
+
+
+@pytest.fixture
+def graphviz(tmp_path, monkeypatch):
+    # fake Graphviz filters that echo their name, arguments and input
+    bin_path = tmp_path / 'bin'
+    bin_path.mkdir()
+
+    for name in (Filter.DOT, Filter.CIRCO, Filter.SFDP):
+        script = bin_path / name
+        script.write_text(FAKE_GRAPHVIZ)
+        script.chmod(0o755)
+
+    failing = bin_path / 'failing'
+    failing.write_text('#!/bin/sh\nexit 3\n')
+    failing.chmod(0o755)
+
+    monkeypatch.setenv('PATH', str(bin_path), prepend=':')
+
+    return tmp_path
+
+
+def test_export_png_streams_dot(graphviz, g):
+    output = graphviz / 'g.png'
+
+    export_png(g, str(output), force_weight=True)
+
+    assert output.read_text() == \
+        'dot -Tpng\n' + to_dot(g, force_weight=True)
+
+    g.link(0, 9)
+
+    export_png(g, str(output))
+
+    assert output.read_text().startswith('sfdp -Tpng\n')
+
+    export_png(Graph(range(4), {(0, 1), (0, 2), (0, 3), (1, 2), (1, 3),
+                                (2, 3)}), str(output))
+
+    assert output.read_text().startswith('circo -Tpng\n')
+
+    with pytest.raises(CalledProcessError):
+        export_png(g, str(output), command='failing')
+
+
+def test_export_png_failing_large_graph(graphviz):
+    # the DOT source overflows the pipe buffer of a filter that never reads
+    g = lattice(40000)
+
+    output = str(graphviz / 'lattice.png')
+
+    with pytest.raises(CalledProcessError):
+        export_png(g, output, command='failing')
+
+    with pytest.raises(CalledProcessError):
+        asyncio.get_event_loop().run_until_complete(
+            export_png_async(g, output, command='failing')
+        )
+
+
+def test_export_png_digraph(graphviz):
+    output = graphviz / 'dg.png'
+
+    dg = Digraph(range(4), {(0, 1), (0, 2), (1, 3), (2, 3)})
+
+    export_png(dg, str(output))
+
+    assert output.read_text() == 'dot -Tpng\n' + to_dot(dg)
+
+    dg.link(3, 0)
+
+    export_png(dg, str(output))
+
+    assert output.read_text().startswith('sfdp -Tpng\n')
+
+
+def test_export_png_async(graphviz, g):
+    outputs = [graphviz / f'{i}.png' for i in range(5)]
+
+    async def render():
+        await asyncio.gather(*(
+            export_png_async(g, str(output)) for output in outputs
+        ))
+
+    asyncio.get_event_loop().run_until_complete(render())
+
+    for output in outputs:
+        assert output.read_text() == 'dot -Tpng\n' + to_dot(g)
+
+    with pytest.raises(CalledProcessError):
+        asyncio.get_event_loop().run_until_complete(
+            export_png_async(g, str(outputs[0]), command='failing')
+        )
+
+
+def test_export_many(graphviz):
+    graphs = [Graph(range(n), zip(range(n - 1), range(1, n)))
+              for n in range(1, 20)]
+
+    outputs = [graphviz / f'{i}.png' for i in range(len(graphs))]
+
+    export_many(zip(graphs, map(str, outputs)), workers=4, command='sfdp')
+
+    for g, output in zip(graphs, outputs):
+        assert output.read_text() == 'sfdp -Tpng\n' + to_dot(g)
+
+    with pytest.raises(CalledProcessError):
+        export_many(zip(graphs, map(str, outputs)), command='failing')
+
+
+@pytest.fixture
+def weighted():
+    g = Graph(range(6), {(0, 1, 5), (1, 2), (2, 0, 3), (3, 4)})
+
+    g.link(4, 4, 2)
+
+    return g
+
+
+@pytest.mark.parametrize('suffix', ['.txt', '.gz'])
+def test_edgelist(tmp_path, weighted, suffix):
+    path = str(tmp_path / f'edges{suffix}')
+
+    write_edgelist(weighted, path)
+
+    g = read_edgelist(path, vertex_type=int)
+
+    weighted.remove(5)
+
+    assert g == weighted
+
+
+def test_edgelist_csv(tmp_path):
+    path = tmp_path / 'edges.csv'
+
+    path.write_text('# source, target, weight\n'
+                    'a, b, 2\n'
+                    '\n'
+                    'b, c\n'
+                    'c, a, 2\n'
+                    'a, c, 4\n')
+
+    g = read_edgelist(str(path), delimiter=',')
+
+    assert g.edges == {('a', 'b', 2), ('b', 'c', 1), ('a', 'c', 4)}
+
+    with pytest.raises(ValueError):
+        read_edgelist(str(path), delimiter=',', strict=True)
+
+    dg = read_edgelist(str(path), directed=True, delimiter=',')
+
+    assert isinstance(dg, Digraph)
+
+    assert dg.edges == {('a', 'b', 2), ('b', 'c', 1), ('c', 'a', 2),
+                        ('a', 'c', 4)}
+
+
+def test_edgelist_raises():
+    with pytest.raises(ValueError):
+        read_edgelist(StringIO('0 1 2 3\n'))
+
+
+def test_edgelist_gzip_magic(tmp_path):
+    path = str(tmp_path / 'edges')
+
+    with gzip.open(path, 'wt') as f:
+        f.write('0 1\n1 2\n')
+
+    assert read_edgelist(path, vertex_type=int) == \
+        Graph(range(3), {(0, 1), (1, 2)})
+
+
+@pytest.mark.parametrize('suffix', ['.txt', '.gz'])
+def test_adjlist(tmp_path, weighted, suffix):
+    path = str(tmp_path / f'adj{suffix}')
+
+    write_adjlist(weighted, path)
+
+    g = read_adjlist(path, vertex_type=int)
+
+    assert g.vertices == weighted.vertices
+    assert {(v1, v2) for v1, v2, _ in g.edges} == \
+        {(v1, v2) for v1, v2, _ in weighted.edges}
+
+
+def test_adjlist_directed():
+    dg = Digraph(range(4), {(0, 1), (1, 0), (1, 2)})
+
+    out = StringIO()
+
+    write_adjlist(dg, out)
+
+    g = read_adjlist(StringIO(out.getvalue()), directed=True, vertex_type=int)
+
+    assert g == dg
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_save_load(tmp_path, weighted, mmap):
+    path = str(tmp_path / 'graph.tundra')
+
+    dg = Digraph(range(4), {(0, 1, 2), (1, 2, 3), (2, 0, 4), (0, 3, 1)})
+
+    for g in (weighted, dg, freeze(dg)):
+        save(g, path)
+
+        loaded = load(path, mmap=mmap)
+
+        assert isinstance(loaded, CSRGraph)
+        assert loaded.directed == g.directed
+        assert loaded.thaw() == (g if isinstance(g, Digraph) else g.thaw())
+
+    assert shortest_distance(loaded, 0) == shortest_distance(dg, 0)
+    assert loaded.predecessors(0) == {2}
+
+
+def test_save_load_float_weights(tmp_path):
+    path = str(tmp_path / 'graph.tundra')
+
+    g = Graph([(0, 0), (0, 1), (1, 0)],
+              {((0, 0), (0, 1), 0.5), ((0, 1), (1, 0))})
+
+    save(g, path)
+
+    loaded = load(path)
+
+    assert loaded.thaw() == g
+    assert loaded.weight[(0, 1), (0, 0)] == 0.5
+    assert loaded.weight[(1, 0), (0, 1)] == 1
+
+
+def test_save_huge_weights(tmp_path):
+    path = tmp_path / 'graph.tundra'
+
+    for weights in [(1, 2 ** 70), (1.5, 2 ** 70 + 1)]:
+        g = Digraph(range(3), {(0, 1, weights[0]), (1, 2, weights[1])})
+
+        with pytest.raises(ValueError, match=str(weights[1])):
+            save(g, str(path))
+
+        assert not path.exists()
+
+
+def test_load_raises(tmp_path):
+    path = tmp_path / 'graph.tundra'
+
+    path.write_bytes(b'not a graph' * 10)
+
+    with pytest.raises(ValueError):
+        load(str(path))
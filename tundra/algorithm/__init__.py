@@ -1,3 +1,5 @@
+from .components import *
+from .dag import *
 from .misc import *
 from .path import *
 from .search import *
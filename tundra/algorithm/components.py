@@ -0,0 +1,189 @@
+from typing import Dict, Iterator, List, Set, Tuple
+
+from tundra import Digraph, Vertex
+
+__all__ = ('connected_components', 'ComponentIndex',
+           'strongly_connected_components', 'condensation')
+
+
+def connected_components(g: Digraph) -> Tuple[Dict[Vertex, int], List[int]]:
+    """
+    Labels every vertex with the id of its connected component, ignoring
+    the direction of the edges, in a single O(V + E) pass
+
+    Returns the map from vertex to component id, and the size of each
+    component indexed by id. Components are numbered in the order their
+    first vertex is found
+    """
+    labels: Dict[Vertex, int] = {}
+    sizes: List[int] = []
+
+    for root in g.vertex_view():
+        if root in labels:
+            continue
+
+        component = len(sizes)
+
+        labels[root] = component
+
+        stack = [root]
+        size = 1
+
+        while stack:
+            for w in g.iter_neighbors(stack.pop()):
+                if w not in labels:
+                    labels[w] = component
+                    stack.append(w)
+                    size += 1
+
+        sizes.append(size)
+
+    return labels, sizes
+
+
+class ComponentIndex:
+    """
+    Answers whether two vertices are in the same connected component in
+    near constant time
+
+    Enables the cache of the graph and queries the union-find forest it
+    maintains, so edges linked to the graph are merged as they come and
+    any other change makes it rebuild on the next query
+    """
+    def __init__(self, g: Digraph) -> None:
+        self._graph = g
+
+        g.enable_cache()
+
+    def link(self, v1: Vertex, v2: Vertex, weight: int = 1) -> None:
+        """
+        Links v1 and v2 in the graph, which merges their components
+        """
+        self._graph.link(v1, v2, weight)
+
+    def connected(self, v1: Vertex, v2: Vertex) -> bool:
+        """
+        Returns True if there is a path between v1 and v2, ignoring the
+        direction of the edges, False otherwise
+        """
+        return self._graph._forest().connected(v1, v2)
+
+    def component(self, v: Vertex) -> Vertex:
+        """
+        Returns a representative vertex of the component containing v
+        """
+        return self._graph._forest().find(v)
+
+    @property
+    def count(self) -> int:
+        """
+        Returns the number of connected components
+        """
+        return self._graph.count_components()
+
+
+def strongly_connected_components(g: Digraph) -> List[List[Vertex]]:
+    """
+    Returns the strongly connected components of the graph, with Tarjan's
+    algorithm in O(V + E) and without recursion
+
+    Every component comes after all the components it has edges to, so
+    the list is in reverse topological order
+    """
+    index: Dict[Vertex, int] = {}
+    low: Dict[Vertex, int] = {}
+
+    # vertices visited but not yet assigned to a component
+    stack: List[Vertex] = []
+    on_stack: Set[Vertex] = set()
+
+    components: List[List[Vertex]] = []
+
+    def visit(v: Vertex) -> None:
+        index[v] = low[v] = len(index)
+
+        stack.append(v)
+        on_stack.add(v)
+
+        work.append((v, iter(g.iter_successors(v))))
+
+    for root in g.vertex_view():
+        if root in index:
+            continue
+
+        work: List[Tuple[Vertex, Iterator[Vertex]]] = []
+
+        visit(root)
+
+        while work:
+            v, successors = work[-1]
+
+            for w in successors:
+                if w not in index:
+                    visit(w)
+                    break
+
+                if w in on_stack and index[w] < low[v]:
+                    low[v] = index[w]
+            else:
+                work.pop()
+
+                if work:
+                    parent = work[-1][0]
+
+                    if low[v] < low[parent]:
+                        low[parent] = low[v]
+
+                if low[v] == index[v]:
+                    component = []
+
+                    while True:
+                        w = stack.pop()
+                        on_stack.remove(w)
+                        component.append(w)
+
+                        if w == v:
+                            break
+
+                    components.append(component)
+
+    return components
+
+
+def condensation(g: Digraph) -> Tuple[Digraph, Dict[Vertex, int]]:
+    """
+    Collapses every strongly connected component of the graph into a
+    single vertex, which gives a directed acyclic graph
+
+    Returns that graph, whose vertices are component ids numbered in
+    topological order, and the map from each vertex of g to the id of its
+    component. An edge between two components weighs as much as the
+    lightest edge it replaces
+    """
+    components = strongly_connected_components(g)
+
+    count = len(components)
+
+    labels: Dict[Vertex, int] = {}
+
+    for i, component in enumerate(components):
+        for v in component:
+            labels[v] = count - 1 - i
+
+    dag = Digraph(range(count))
+
+    for v1 in g.vertex_view():
+        c1 = labels[v1]
+
+        for v2, weight in g.weighted_successors(v1):
+            c2 = labels[v2]
+
+            if c1 == c2:
+                continue
+
+            if not dag.has_edge(c1, c2):
+                dag.link(c1, c2, weight)
+            elif weight < dag.weight[c1, c2]:
+                dag.weight[c1, c2] = weight
+
+    return dag, labels
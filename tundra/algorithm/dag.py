@@ -0,0 +1,144 @@
+from collections import deque
+from math import inf
+from typing import (Callable, Dict, Iterator, List, NamedTuple, Optional,
+                    Tuple)
+
+from tundra import Digraph, Vertex
+
+__all__ = ('CycleFound', 'topological_sort', 'dag_shortest_paths',
+           'dag_longest_path', 'CriticalPath')
+
+
+class CycleFound(Exception):
+    pass
+
+
+def topological_sort(g: Digraph) -> Iterator[Vertex]:
+    """
+    Lazily yields the vertices so that every edge goes from a vertex to a
+    later one, with Kahn's algorithm in O(V + E)
+
+    Raises CycleFound once every vertex outside of cycles has been yielded,
+    if the graph has a cycle
+    """
+    indegree = {v: g.indegree(v) for v in g.vertex_view()}
+
+    ready = deque(v for v, d in indegree.items() if d == 0)
+
+    emitted = 0
+
+    while ready:
+        v = ready.popleft()
+
+        yield v
+
+        emitted += 1
+
+        for w in g.iter_successors(v):
+            indegree[w] -= 1
+
+            if indegree[w] == 0:
+                ready.append(w)
+
+    if emitted != len(indegree):
+        raise CycleFound('the graph has a cycle')
+
+
+def _order(g: Digraph) -> List[Vertex]:
+    """
+    Returns a topological order of the graph, memoized in its property
+    cache if it has one
+    """
+    if isinstance(g, Digraph):
+        return g.cached(topological_sort, lambda: list(topological_sort(g)))
+
+    return list(topological_sort(g))
+
+
+def _relax(
+    g: Digraph,
+    distance: Dict[Vertex, float],
+    better: Callable[[float, float], bool],
+) -> Dict[Vertex, Optional[Vertex]]:
+    """
+    Relaxes every edge once in topological order, starting from the
+    vertices already in distance
+
+    Returns the previous vertex on the best path to each reached vertex
+    """
+    previous: Dict[Vertex, Optional[Vertex]] = dict.fromkeys(distance)
+
+    for v in _order(g):
+        d = distance.get(v)
+
+        if d is None:
+            continue
+
+        for w, weight in g.weighted_successors(v):
+            candidate = d + weight
+
+            current = distance.get(w)
+
+            if current is None or better(candidate, current):
+                distance[w] = candidate
+                previous[w] = v
+
+    return previous
+
+
+def _walk(
+    previous: Dict[Vertex, Optional[Vertex]],
+    end: Vertex,
+) -> List[Vertex]:
+    path = [end]
+
+    while previous[path[-1]] is not None:
+        path.append(previous[path[-1]])  # type: ignore
+
+    return list(reversed(path))
+
+
+def dag_shortest_paths(
+    g: Digraph,
+    start: Vertex,
+) -> Tuple[Dict[Vertex, float], Dict[Vertex, Optional[Vertex]]]:
+    """
+    Returns the shortest distances from start in a directed acyclic graph,
+    inf for unreachable vertices, and the previous vertex on each shortest
+    path
+
+    Runs in O(V + E), and accepts negative weights
+    """
+    distance: Dict[Vertex, float] = {start: 0}
+
+    previous = _relax(g, distance, lambda a, b: a < b)
+
+    return {v: distance.get(v, inf) for v in g.vertex_view()}, previous
+
+
+class CriticalPath(NamedTuple):
+    path: List[Vertex]
+    length: float
+
+
+def dag_longest_path(
+    g: Digraph,
+    start: Optional[Vertex] = None,
+) -> CriticalPath:
+    """
+    Returns the heaviest path of a directed acyclic graph, starting at
+    start if it is given, and its length, in O(V + E)
+    """
+    if g.order == 0:
+        return CriticalPath([], 0)
+
+    if start is None:
+        distance: Dict[Vertex, float] = dict.fromkeys(g.vertex_view(), 0)
+    else:
+        distance = {start: 0}
+
+    previous = _relax(g, distance, lambda a, b: a > b)
+
+    end = max(distance, key=distance.__getitem__)
+
+    return CriticalPath(_walk(previous, end), distance[end])
@@ -1,36 +1,190 @@
-from typing import Dict, Iterable, Set
+from typing import Dict, Iterable, List, Set
 
 from tundra import Graph, Vertex
 
-__all__ = ('fringe', 'coloring')
+__all__ = ('fringe', 'coloring', 'ColoringStrategy')
 
 
 def fringe(g: Graph, selected: Iterable[Vertex]) -> Set[Vertex]:
     selected = set(selected)
 
-    if not selected.issubset(g.vertices):
+    if not g.vertex_view() >= selected:
         raise ValueError("selected is not a subset of the graph's vertices")
 
     fr = set()
 
     for v in selected:
-        for v2 in g.neighbors(v):
+        for v2 in g.iter_neighbors(v):
             if v2 not in selected:
                 fr.add(v2)
 
     return fr
 
 
-def coloring(g: Graph) -> Dict[Vertex, int]:
+class ColoringStrategy:
+    LARGEST_FIRST = 'largest_first'
+    SMALLEST_LAST = 'smallest_last'
+    DSATUR = 'dsatur'
+
+
+def _lowest_free(used: int) -> int:
+    """
+    Returns the lowest color whose bit isn't set in used
+    """
+    return (~used & (used + 1)).bit_length() - 1
+
+
+def _largest_first(g: Graph) -> List[Vertex]:
+    """
+    Returns the vertices by decreasing degree, bucket sorted in O(V + E)
+    """
+    buckets: List[List[Vertex]] = []
+
+    for v in g.vertex_view():
+        degree = g.degree(v)
+
+        while len(buckets) <= degree:
+            buckets.append([])
+
+        buckets[degree].append(v)
+
+    return [v for bucket in reversed(buckets) for v in bucket]
+
+
+def _smallest_last(g: Graph) -> List[Vertex]:
+    """
+    Returns the vertices in the reverse of the order they are taken out by
+    repeatedly removing one of minimum degree, in O(V + E)
+    """
+    degree = {v: g.degree(v) for v in g.vertex_view()}
+
+    buckets: List[Set[Vertex]] = [set() for _ in range(len(degree) + 1)]
+
+    for v, d in degree.items():
+        buckets[d].add(v)
+
+    removed: List[Vertex] = []
+
+    lowest = 0
+
+    for _ in range(len(degree)):
+        while not buckets[lowest]:
+            lowest += 1
+
+        v = buckets[lowest].pop()
+
+        del degree[v]
+        removed.append(v)
+
+        for w in g.iter_neighbors(v):
+            if w in degree:
+                d = degree[w]
+
+                buckets[d].remove(w)
+                buckets[d - 1].add(w)
+                degree[w] = d - 1
+
+        # removing v lowers its neighbors by one degree at most
+        lowest = max(lowest - 1, 0)
+
+    removed.reverse()
+
+    return removed
+
+
+def _greedy(g: Graph, order: Iterable[Vertex]) -> Dict[Vertex, int]:
     colors: Dict[Vertex, int] = {}
 
-    for v in g.vertices:
-        available = [True] * g.order
+    for v in order:
+        used = 0
+
+        for adj in g.iter_neighbors(v):
+            c = colors.get(adj)
 
-        for adj in g.neighbors(v):
-            if colors.get(adj) is not None:
-                available[colors[adj]] = False
+            if c is not None:
+                used |= 1 << c
 
-        colors[v] = available.index(True)
+        colors[v] = _lowest_free(used)
 
     return colors
+
+
+def _dsatur(g: Graph) -> Dict[Vertex, int]:
+    """
+    Colors next the vertex with the most distinct colors among its
+    neighbors, kept in a bucket queue by that count
+    """
+    colors: Dict[Vertex, int] = {}
+
+    # colors among the neighbors of each uncolored vertex, as a bitmask
+    used: Dict[Vertex, int] = {}
+    saturation: Dict[Vertex, int] = {}
+
+    # dicts keep insertion order and popitem takes the last vertex, so
+    # seeding by increasing degree breaks the first ties in favor of the
+    # vertex of largest degree
+    buckets: List[Dict[Vertex, None]] = [{}]
+
+    for v in reversed(_largest_first(g)):
+        used[v] = 0
+        saturation[v] = 0
+        buckets[0][v] = None
+
+    highest = 0
+
+    for _ in range(len(used)):
+        while not buckets[highest]:
+            highest -= 1
+
+        v, _ = buckets[highest].popitem()
+
+        c = colors[v] = _lowest_free(used.pop(v))
+        del saturation[v]
+
+        bit = 1 << c
+
+        for w in g.iter_neighbors(v):
+            mask = used.get(w)
+
+            if mask is None or mask & bit:
+                continue
+
+            used[w] = mask | bit
+
+            s = saturation[w]
+
+            if s + 1 == len(buckets):
+                buckets.append({})
+
+            del buckets[s][w]
+            buckets[s + 1][w] = None
+            saturation[w] = s + 1
+
+            if s + 1 > highest:
+                highest = s + 1
+
+    return colors
+
+
+def coloring(
+    g: Graph,
+    strategy: str = ColoringStrategy.LARGEST_FIRST,
+) -> Dict[Vertex, int]:
+    """
+    Greedily colors the vertices so that no neighbors share a color, using
+    colors 0, 1, 2, ... in O(V + E)
+
+    The strategy picks the order in which vertices are colored: largest
+    degree first (Welsh-Powell), smallest-last degeneracy order, or DSATUR,
+    which is slower but usually needs the fewest colors
+    """
+    if strategy == ColoringStrategy.LARGEST_FIRST:
+        return _greedy(g, _largest_first(g))
+
+    if strategy == ColoringStrategy.SMALLEST_LAST:
+        return _greedy(g, _smallest_last(g))
+
+    if strategy == ColoringStrategy.DSATUR:
+        return _dsatur(g)
+
+    raise ValueError(f'unknown coloring strategy {strategy!r}')
@@ -1,53 +1,178 @@
 from collections import deque
-from typing import Callable, Deque, Optional, Set
+from typing import (Callable, Deque, Dict, Iterator, List, Optional, Set,
+                    Tuple)
 
 from tundra import Graph, Vertex
 
 Test = Callable[[Vertex], bool]
 
-__all__ = ('bfs', 'dfs')
+Follow = Callable[[Vertex, Vertex], bool]
 
+Visit = Tuple[Vertex, int, Optional[Vertex]]
 
-def dfs(g: Graph, current: Vertex, condition: Test,
-        visited: Set = None) -> Optional[Vertex]:
+__all__ = ('bfs', 'dfs', 'iter_bfs', 'iter_dfs',
+           'dfs_preorder', 'dfs_postorder')
 
-    visited = visited or set()
 
-    if current in visited:
-        return None
+def _dfs(
+    g: Graph,
+    start: Vertex,
+    visited: Set[Vertex],
+    max_depth: Optional[int] = None,
+    follow: Optional[Follow] = None,
+) -> Iterator[Tuple[Vertex, int, Optional[Vertex], bool]]:
+    """
+    Walks the graph depth-first from start with an explicit stack, yielding
+    (v, depth, parent, False) when v is discovered and
+    (v, depth, parent, True) when it is finished
 
-    visited.add(current)
+    With max_depth, a visited vertex reached again by a shorter path is
+    expanded again, without being reported twice, so that nothing within
+    max_depth of start is missed
+    """
+    if start in visited:
+        return
 
-    if condition(current):
-        return current
+    def expand(v: Vertex, depth: int) -> Iterator[Vertex]:
+        if depth == max_depth:
+            return iter(())
 
-    for n in g.neighbors(current):
-        v = dfs(g, n, condition, visited)
+        return iter(g.iter_neighbors(v))
 
-        if v is not None:
-            return v
+    # depth of the shortest path found so far to each visited vertex
+    shallowest: Dict[Vertex, int] = {start: 0}
 
-    return None
+    visited.add(start)
 
+    yield start, 0, None, False
 
-def bfs(g: Graph, start: Vertex,
-        condition: Test) -> Optional[Vertex]:
+    stack: List[
+        Tuple[Vertex, int, Optional[Vertex], Iterator[Vertex], bool]
+    ] = [(start, 0, None, expand(start, 0), False)]
+
+    while stack:
+        current, depth, parent, neighbors, again = stack[-1]
+
+        for n in neighbors:
+            if n in visited and (
+                    max_depth is None or shallowest[n] <= depth + 1):
+                continue
+
+            if follow is not None and not follow(current, n):
+                continue
+
+            seen = n in visited
 
-    deq: Deque[Vertex] = deque()
+            visited.add(n)
+
+            if max_depth is not None:
+                shallowest[n] = depth + 1
+
+            if not seen:
+                yield n, depth + 1, current, False
+
+            stack.append(
+                (n, depth + 1, current, expand(n, depth + 1), seen)
+            )
+
+            break
+        else:
+            stack.pop()
+
+            if not again:
+                yield current, depth, parent, True
+
+
+def iter_dfs(
+    g: Graph,
+    start: Vertex,
+    max_depth: Optional[int] = None,
+    follow: Optional[Follow] = None,
+) -> Iterator[Visit]:
+    """
+    Lazily yields (vertex, depth, parent) in depth-first preorder
+
+    Vertices deeper than max_depth in the search tree are not explored,
+    and an edge (v, n) is only followed if follow(v, n) is true
+    """
+    return (
+        (v, depth, parent)
+        for v, depth, parent, finished in _dfs(g, start, set(),
+                                               max_depth, follow)
+        if not finished
+    )
+
+
+def iter_bfs(
+    g: Graph,
+    start: Vertex,
+    max_depth: Optional[int] = None,
+    follow: Optional[Follow] = None,
+) -> Iterator[Visit]:
+    """
+    Lazily yields (vertex, depth, parent) in breadth-first order
+
+    Vertices farther than max_depth from start are not explored, and an
+    edge (v, n) is only followed if follow(v, n) is true
+    """
+    deq: Deque[Visit] = deque()
     visited = set()
 
-    deq.append(start)
+    deq.append((start, 0, None))
     visited.add(start)
 
     while len(deq) > 0:
-        cur = deq.popleft()
+        visit = deq.popleft()
+
+        yield visit
 
-        if condition(cur):
-            return cur
+        cur, depth, _ = visit
 
-        for n in g.neighbors(cur):
-            if n not in visited:
-                deq.append(n)
-                visited.add(n)
+        if depth == max_depth:
+            continue
+
+        for n in g.iter_neighbors(cur):
+            if n in visited:
+                continue
+
+            if follow is not None and not follow(cur, n):
+                continue
+
+            deq.append((n, depth + 1, cur))
+            visited.add(n)
+
+
+def dfs_preorder(g: Graph, start: Vertex) -> Iterator[Vertex]:
+    """
+    Yields the vertices reachable from start in depth-first preorder
+    """
+    return (v for v, *_, finished in _dfs(g, start, set()) if not finished)
+
+
+def dfs_postorder(g: Graph, start: Vertex) -> Iterator[Vertex]:
+    """
+    Yields the vertices reachable from start in depth-first postorder
+    """
+    return (v for v, *_, finished in _dfs(g, start, set()) if finished)
+
+
+def dfs(g: Graph, current: Vertex, condition: Test,
+        visited: Set = None) -> Optional[Vertex]:
+
+    visited = visited or set()
+
+    for v, *_, finished in _dfs(g, current, visited):
+        if not finished and condition(v):
+            return v
+
+    return None
+
+
+def bfs(g: Graph, start: Vertex,
+        condition: Test) -> Optional[Vertex]:
+
+    for v, _, _ in iter_bfs(g, start):
+        if condition(v):
+            return v
 
     return None
@@ -1,44 +1,57 @@
-from math import inf
-from typing import Dict, cast
+from heapq import heapify, heappop, heappush
+from itertools import chain, count
+from typing import Optional
 
-from tundra import Graph, Vertex
-from tundra.algorithm.tests import transitive_closure
+from tundra import DisjointSet, Graph, Vertex
 
 __all__ = ('prim', 'kruskal')
 
 
-def prim(g: Graph) -> Graph:
+def prim(g: Graph, start: Optional[Vertex] = None) -> Graph:
     """
     Constructs a minimum spanning tree using Prim's algorithm
-    """
-    cost: Dict[Vertex, float] = {v: inf for v in g.vertices}
-    edge: Dict[Vertex, Vertex] = {v: None for v in g.vertices}
 
+    The tree is grown from start, or from an arbitrary vertex. If g is not
+    connected, a minimum spanning forest is returned
+    """
     tree = Graph()
 
-    vertices_left = g.vertices
+    in_tree = tree.vertex_view()
+
+    roots = g.vertex_view()
+
+    if start is not None:
+        roots = chain((start,), roots)  # type: ignore
+
+    # the counter breaks ties, so vertices are never compared
+    tiebreak = count()
 
-    while vertices_left:
-        # find the vertex in the fringe with the minimal cost
-        (current_vertex, current_cost) = min(
-            cost.items(),
-            key=lambda t: t[1],
-        )
+    for root in roots:
+        if root in in_tree:
+            continue
 
-        for v in g.neighbors(current_vertex):
-            if v in cost and g.weight[v, current_vertex] < cost[v]:
-                cost[v] = g.weight[v, current_vertex]
-                edge[v] = current_vertex
+        tree.insert(root)
 
-        tree.insert(current_vertex)
+        # the fringe: edges leaving the tree, with lazy deletion of the
+        # ones whose endpoint has since joined it
+        fringe = [
+            (w, next(tiebreak), v, root)
+            for v, w in g.weighted_successors(root)
+        ]
+        heapify(fringe)
 
-        if current_cost != inf:
-            tree.link(current_vertex, edge[current_vertex],
-                      cast(int, current_cost))
+        while fringe:
+            w, _, current, parent = heappop(fringe)
 
-        del edge[current_vertex]
-        del cost[current_vertex]
-        vertices_left.remove(current_vertex)
+            if current in in_tree:
+                continue
+
+            tree.insert(current)
+            tree.link(parent, current, w)
+
+            for v, wv in g.weighted_successors(current):
+                if v not in in_tree:
+                    heappush(fringe, (wv, next(tiebreak), v, current))
 
     return tree
 
@@ -47,23 +60,24 @@ def kruskal(g: Graph) -> Graph:
     """
     Constructs a minimum spanning tree using Kruskal's algorithm
 
-    The input graph must not have parallel edges or loops
+    The input graph must not have parallel edges or loops. If it is not
+    connected, a minimum spanning forest is returned
     """
-    for v1, v2, _ in g.edges:
+    edges = g.edges
+
+    for v1, v2, _ in edges:
         if v1 == v2:
             raise ValueError("g can't have loops")
 
-    edges = sorted(g.edges, key=lambda e: e[2], reverse=True)
-
-    t = Graph(g.vertices)
+    t = Graph(g.vertex_view())
 
-    n_edges = 0
+    components = DisjointSet(g.vertex_view())
 
-    while t.order - 1 > n_edges:
-        v1, v2, w = edges.pop()
+    for v1, v2, w in sorted(edges, key=lambda e: e[2]):
+        if components.count == 1:
+            break
 
-        if v1 not in transitive_closure(t, v2):
+        if components.union(v1, v2):
             t.link(v1, v2, w)
-            n_edges += 1
 
     return t
@@ -1,31 +1,55 @@
-from random import choice
-from typing import Optional, Set
+from functools import wraps
+from typing import Callable, Dict, Optional, Set, TypeVar
 
 from tundra import Digraph, Graph, Vertex
 
-__all__ = ('is_tree', 'is_regular', 'is_complete',
-           'is_connected', 'has_cycle', 'transitive_closure')
+from .components import strongly_connected_components
 
+__all__ = ('is_tree', 'is_regular', 'is_complete', 'is_connected',
+           'is_strongly_connected', 'has_cycle', 'has_directed_cycle',
+           'transitive_closure')
 
-def _random_vertex(g: Digraph) -> Vertex:
+G = TypeVar('G', bound=Digraph)
+
+
+def _cached(test: Callable[[G], bool]) -> Callable[[G], bool]:
+    """
+    Memoizes the test in the property cache of the graph, if it has one
+    """
+    @wraps(test)
+    def wrapper(g: G) -> bool:
+        if isinstance(g, Digraph):
+            return g.cached(test, lambda: test(g))
+
+        return test(g)
+
+    return wrapper
+
+
+def _any_vertex(g: Digraph) -> Vertex:
     """
-    Returns a random vertex of the graph
+    Returns an arbitrary vertex of the graph
     """
-    return choice(tuple(g.vertices))
+    return next(iter(g.vertex_view()))
 
 
+@_cached
 def is_regular(g: Digraph) -> bool:
     """
     Return True if all vertices have the same degree, False otherwise
     """
+    if isinstance(g, Digraph):
+        return len(g.degree_histogram()) <= 1
+
     if g.order == 0:
         return True
 
-    degree = g.degree(_random_vertex(g))
+    degree = g.degree(_any_vertex(g))
 
-    return all(g.degree(v) == degree for v in g.vertices)
+    return all(g.degree(v) == degree for v in g.vertex_view())
 
 
+@_cached
 def is_complete(g: Digraph) -> bool:
     """
     Returns True if every vertex is connected to all other vertices,
@@ -33,21 +57,38 @@ def is_complete(g: Digraph) -> bool:
     """
     degree = g.order - 1
 
-    return all(g.degree(v) == degree for v in g.vertices)
+    if isinstance(g, Digraph):
+        return set(g.degree_histogram()) <= {degree}
+
+    return all(g.degree(v) == degree for v in g.vertex_view())
 
 
-def is_connected(g: Graph) -> bool:
+@_cached
+def is_connected(g: Digraph) -> bool:
     """
     Returns True if there is a path between every pair of vertices,
-    False otherwise
+    ignoring the direction of the edges, False otherwise
     """
     if g.order == 0:
         return True
 
-    return g.vertices == transitive_closure(g, _random_vertex(g))
+    if isinstance(g, Digraph):
+        return g.count_components() == 1
+
+    return g.order == len(transitive_closure(g, _any_vertex(g)))
 
 
-def is_tree(g: Graph) -> bool:
+@_cached
+def is_strongly_connected(g: Digraph) -> bool:
+    """
+    Returns True if there is a path following the direction of the edges
+    from every vertex to every other, False otherwise
+    """
+    return len(strongly_connected_components(g)) <= 1
+
+
+@_cached
+def is_tree(g: Digraph) -> bool:
     """
     Returns True if the graph is connected and has no cycles,
     False otherwise
@@ -55,63 +96,117 @@ def is_tree(g: Graph) -> bool:
     if g.order == 0:
         return False
 
-    v = _random_vertex(g)
-
-    return is_connected(g) and not _cycle_with(g, v, v)
+    return _size(g) == g.order - 1 and is_connected(g)
 
 
-def has_cycle(g: Graph) -> bool:
+@_cached
+def has_cycle(g: Digraph) -> bool:
     """
     Returns True if there is a cycle in the graph, False otherwise
     """
-    if g.order == 0:
-        return False
+    # a forest with V vertices and C components has exactly V - C edges,
+    # and any further edge closes a cycle
+    return _size(g) > g.order - _count_components(g)
+
+
+@_cached
+def has_directed_cycle(g: Digraph) -> bool:
+    """
+    Returns True if there is a cycle following the direction of the edges,
+    False otherwise
+    """
+    # False while the vertex is on the stack, True once it is finished
+    finished: Dict[Vertex, bool] = {}
 
-    v = _random_vertex(g)
+    for root in g.vertex_view():
+        if root in finished:
+            continue
 
-    return _cycle_with(g, v, v)
+        finished[root] = False
 
+        stack = [(root, iter(g.iter_successors(root)))]
 
-def transitive_closure(
-        g: Graph,
-        v: Vertex,
-        visited: Optional[Set[Vertex]] = None) -> Set[Vertex]:
+        while stack:
+            v, successors = stack[-1]
+
+            for w in successors:
+                state = finished.get(w)
+
+                if state is None:
+                    finished[w] = False
+
+                    stack.append((w, iter(g.iter_successors(w))))
+
+                    break
+
+                if not state:
+                    return True
+            else:
+                stack.pop()
+
+                finished[v] = True
+
+    return False
+
+
+def _size(g: Digraph) -> int:
     """
-    Returns a set containing all vertices reachable from v
+    Returns the number of edges, ignoring their direction
     """
-    visited = visited or set()
+    if isinstance(g, Graph):
+        return g.size
 
-    visited.add(v)
+    degrees = 0
+    loops = 0
 
-    for v_neigh in g.neighbors(v):
-        if v_neigh not in visited:
-            transitive_closure(g, v_neigh, visited)
+    for v in g.vertex_view():
+        degrees += g.degree(v)
 
-    return visited
+        if g.has_edge(v, v):
+            loops += 1
 
+    # a loop adds one to the degree of its vertex, every other edge adds one
+    # to the degree of each endpoint
+    return (degrees + loops) // 2
 
-def _cycle_with(
-        g: Graph,
-        v: Vertex,
-        v_prev: Vertex,
-        visited: Set[Vertex]=None
-) -> bool:
+
+def _count_components(g: Digraph) -> int:
     """
-    Returns True if there is a cycle in the graph containing v,
-    False otherwise
+    Returns the number of connected components of the graph
     """
-    visited = visited or set()
+    if isinstance(g, Digraph):
+        return g.count_components()
 
-    if v in visited:
-        return True
+    visited: Set[Vertex] = set()
+
+    count = 0
+
+    for v in g.vertex_view():
+        if v not in visited:
+            transitive_closure(g, v, visited)
+            count += 1
+
+    return count
+
+
+def transitive_closure(
+        g: Digraph,
+        v: Vertex,
+        visited: Optional[Set[Vertex]] = None) -> Set[Vertex]:
+    """
+    Returns a set containing all vertices reachable from v
+    """
+    if visited is None:
+        visited = set()
 
     visited.add(v)
 
-    for v_neigh in g.neighbors(v):
-        if v_neigh != v_prev:
-            if _cycle_with(g, v_neigh, v, visited):
-                return True
+    stack = [v]
 
-    visited.remove(v)
+    while stack:
+        for v_neigh in g.iter_neighbors(stack.pop()):
+            if v_neigh not in visited:
+                visited.add(v_neigh)
+                stack.append(v_neigh)
 
-    return False
+    return visited
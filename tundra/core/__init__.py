@@ -1,2 +1,5 @@
 from .digraph import *
 from .graph import Graph
+from .csr import CSRGraph, freeze
+from .disjoint_set import DisjointSet
+from .implicit import ImplicitGraph
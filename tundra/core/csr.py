@@ -0,0 +1,428 @@
+from array import array
+from bisect import bisect_left
+from itertools import chain
+from typing import (Any, Dict, Iterable, Iterator, KeysView, List, Optional,
+                    Sequence, Set, Tuple)
+
+from .digraph import Digraph, Vertex
+from .graph import Graph
+
+__all__ = ('CSRGraph', 'freeze')
+
+
+class _Row:
+    """
+    Read-only view over the vertices stored in one row of a CSR array
+    """
+    def __init__(
+            self,
+            graph: 'CSRGraph',
+            targets: Sequence[int],
+            lo: int,
+            hi: int,
+    ) -> None:
+
+        self._graph = graph
+        self._targets = targets
+        self._lo = lo
+        self._hi = hi
+
+    def __iter__(self) -> Iterator[Vertex]:
+        labels = self._graph._labels
+        targets = self._targets
+
+        for i in range(self._lo, self._hi):
+            yield labels[targets[i]]
+
+    def __len__(self) -> int:
+        return self._hi - self._lo
+
+    def __contains__(self, v: object) -> bool:
+        return self._graph._find(self._targets, self._lo, self._hi, v) >= 0
+
+
+class _WeightedRow(_Row):
+    """
+    Read-only view over the (vertex, weight) pairs stored in one row of a
+    CSR array
+
+    positions maps each entry of the row to the index of its weight, for
+    rows whose weights are not stored alongside them
+    """
+    def __init__(
+            self,
+            graph: 'CSRGraph',
+            targets: Sequence[int],
+            positions: Optional[Sequence[int]],
+            lo: int,
+            hi: int,
+    ) -> None:
+
+        super().__init__(graph, targets, lo, hi)
+
+        self._positions = positions
+
+    def __iter__(self) -> Iterator[Tuple[Vertex, int]]:  # type: ignore
+        labels = self._graph._labels
+        weights = self._graph._weights
+        targets = self._targets
+        positions = self._positions
+
+        for i in range(self._lo, self._hi):
+            pos = i if positions is None else positions[i]
+
+            yield labels[targets[i]], weights[pos]
+
+    def __contains__(self, item: object) -> bool:
+        if not isinstance(item, tuple) or len(item) != 2:
+            return False
+
+        v, weight = item
+
+        pos = self._graph._find(self._targets, self._lo, self._hi, v)
+
+        if pos < 0:
+            return False
+
+        if self._positions is not None:
+            pos = self._positions[pos]
+
+        return self._graph._weights[pos] == weight
+
+
+class CSRWeight:
+    def __init__(self, graph: 'CSRGraph') -> None:
+        self._graph = graph
+
+    def __getitem__(self, item: Tuple[Vertex, Vertex]) -> int:
+        v1, v2 = item
+
+        g = self._graph
+        i = g._index[v1]
+
+        pos = g._find(g._targets, g._offsets[i], g._offsets[i + 1], v2)
+
+        if pos < 0:
+            raise KeyError(f'{v1} and {v2} are not neighbors')
+
+        return g._weights[pos]
+
+    def __setitem__(self, item: Tuple[Vertex, Vertex], weight: int):
+        raise TypeError('CSRGraph is read-only')
+
+
+class CSRGraph:
+    """
+    Immutable snapshot of a Graph or Digraph in compressed sparse row form
+
+    The successors of the vertex with index i are the labels of
+    targets[offsets[i]:offsets[i + 1]], sorted by index, and the weights of
+    those edges are stored at the same positions in weights. An undirected
+    graph stores each edge in both rows.
+    """
+    def __init__(
+            self,
+            labels: Sequence[Vertex],
+            offsets: Sequence[int],
+            targets: Sequence[int],
+            weights: Sequence[int],
+            directed: bool,
+    ) -> None:
+
+        self._labels = labels
+        self._index: Dict[Vertex, int] = {v: i for i, v in enumerate(labels)}
+
+        self._offsets = offsets
+        self._targets = targets
+        self._weights = weights
+
+        self.directed = directed
+
+        # offsets, sources and forward positions of the incoming edges of
+        # a directed graph, built on first use
+        self._reverse: Optional[
+            Tuple[Sequence[int], Sequence[int], Sequence[int]]
+        ] = None
+
+        self.weight: CSRWeight = CSRWeight(self)
+
+    def _find(self, targets: Sequence[int], lo: int, hi: int,
+              v: object) -> int:
+        """
+        Returns the position of v in targets[lo:hi], or -1 if it's not there
+        """
+        i = self._index.get(v)
+
+        if i is None:
+            return -1
+
+        pos = bisect_left(targets, i, lo, hi)
+
+        if pos < hi and targets[pos] == i:
+            return pos
+
+        return -1
+
+    def _incoming(
+            self
+    ) -> Tuple[Sequence[int], Sequence[int], Optional[Sequence[int]]]:
+        """
+        Returns the offsets and sources of the incoming edges, and the
+        positions of their weights
+        """
+        if not self.directed:
+            return self._offsets, self._targets, None
+
+        if self._reverse is None:
+            offsets = array('l', [0]) * (self.order + 1)
+
+            for t in self._targets:
+                offsets[t + 1] += 1
+
+            for i in range(self.order):
+                offsets[i + 1] += offsets[i]
+
+            sources = array('l', [0]) * len(self._targets)
+            positions = array('l', [0]) * len(self._targets)
+            fill = array('l', offsets)
+
+            # sources are visited in increasing order, so rows come out sorted
+            for i in range(self.order):
+                for pos in range(self._offsets[i], self._offsets[i + 1]):
+                    t = self._targets[pos]
+                    sources[fill[t]] = i
+                    positions[fill[t]] = pos
+                    fill[t] += 1
+
+            self._reverse = (offsets, sources, positions)
+
+        return self._reverse
+
+    def _successor_row(self, v: Vertex) -> _Row:
+        i = self._index[v]
+
+        return _Row(self, self._targets,
+                    self._offsets[i], self._offsets[i + 1])
+
+    def _predecessor_row(self, v: Vertex) -> _Row:
+        i = self._index[v]
+        offsets, sources, _ = self._incoming()
+
+        return _Row(self, sources, offsets[i], offsets[i + 1])
+
+    def has_edge(self, v1: Vertex, v2: Vertex) -> bool:
+        """
+        Return True if there is an edge between v1 and v2, False otherwise
+        """
+        return v2 in self._successor_row(v1)
+
+    @property
+    def vertices(self) -> Set[Vertex]:
+        """
+        Returns a set containing the vertices of the graph
+        """
+        return set(self._labels)
+
+    @property
+    def edges(self) -> Set[Tuple[Vertex, Vertex, int]]:
+        """
+        Returns a set containing the edges of the graph
+        """
+        # undirected edges are ordered, so vertices must be comparable
+        labels: Sequence[Any] = self._labels
+
+        edges = set()
+
+        for i, v1 in enumerate(labels):
+            for pos in range(self._offsets[i], self._offsets[i + 1]):
+                v2 = labels[self._targets[pos]]
+                weight = self._weights[pos]
+
+                if self.directed:
+                    edges.add((v1, v2, weight))
+                else:
+                    edges.add((min(v1, v2), max(v1, v2), weight))
+
+        return edges
+
+    def vertex_view(self) -> KeysView[Vertex]:
+        """
+        Returns a read-only view of the vertices of the graph
+        """
+        return self._index.keys()
+
+    def predecessors(self, v: Vertex) -> Set[Vertex]:
+        return set(self._predecessor_row(v))
+
+    def successors(self, v: Vertex) -> Set[Vertex]:
+        return set(self._successor_row(v))
+
+    def neighbors(self, v: Vertex) -> Set[Vertex]:
+        """
+        Returns a set containing the neighbors of v
+        """
+        if not self.directed:
+            return self.successors(v)
+
+        return self.predecessors(v) | self.successors(v)
+
+    def iter_predecessors(self, v: Vertex) -> _Row:
+        """
+        Returns a read-only view of the predecessors of v
+        """
+        return self._predecessor_row(v)
+
+    def iter_successors(self, v: Vertex) -> _Row:
+        """
+        Returns a read-only view of the successors of v
+        """
+        return self._successor_row(v)
+
+    def iter_neighbors(self, v: Vertex) -> Iterable[Vertex]:
+        """
+        Iterates over the neighbors of v without copying them
+        """
+        successors = self._successor_row(v)
+
+        if not self.directed:
+            return successors
+
+        return chain(
+            successors,
+            (w for w in self._predecessor_row(v) if w not in successors),
+        )
+
+    def weighted_predecessors(self, v: Vertex) -> _WeightedRow:
+        """
+        Returns a read-only view of the (predecessor, weight) pairs of v
+        """
+        i = self._index[v]
+        offsets, sources, positions = self._incoming()
+
+        return _WeightedRow(self, sources, positions,
+                            offsets[i], offsets[i + 1])
+
+    def weighted_successors(self, v: Vertex) -> _WeightedRow:
+        """
+        Returns a read-only view of the (successor, weight) pairs of v
+        """
+        i = self._index[v]
+
+        return _WeightedRow(self, self._targets, None,
+                            self._offsets[i], self._offsets[i + 1])
+
+    def indegree(self, v: Vertex) -> int:
+        return len(self._predecessor_row(v))
+
+    def outdegree(self, v: Vertex) -> int:
+        return len(self._successor_row(v))
+
+    def degree(self, v: Vertex) -> int:
+        """
+        Returns the number of neighbors of v
+        """
+        if not self.directed:
+            return len(self._successor_row(v))
+
+        return len(self.neighbors(v))
+
+    @property
+    def order(self) -> int:
+        """
+        Returns the number of vertices in the graph
+        """
+        return len(self._labels)
+
+    def thaw(self) -> Digraph:
+        """
+        Returns a mutable Graph or Digraph with the same vertices and edges
+        """
+        g = Digraph() if self.directed else Graph()
+
+        for v in self._labels:
+            g.insert(v)
+
+        labels = self._labels
+
+        for i, v1 in enumerate(labels):
+            for pos in range(self._offsets[i], self._offsets[i + 1]):
+                v2 = labels[self._targets[pos]]
+
+                if not g.has_edge(v1, v2):
+                    g.link(v1, v2, self._weights[pos])
+
+        return g
+
+    def __str__(self) -> str:
+        return f'{type(self).__name__}({self.vertices}, {self.edges})'
+
+    def __reduce__(self) -> Tuple:
+        # only the arrays are pickled, copying memory-mapped views, and the
+        # index and incoming edges are rebuilt on the other side
+        return CSRGraph, (
+            list(self._labels),
+            _copy(self._offsets),
+            _copy(self._targets),
+            _copy(self._weights),
+            self.directed,
+        )
+
+
+def _copy(a: Sequence) -> Sequence:
+    """
+    Returns a memoryview as an array of the same type, or a as is
+    """
+    if isinstance(a, memoryview):
+        return array(a.format, a.tobytes())
+
+    return a
+
+
+def freeze(g: Digraph) -> CSRGraph:
+    """
+    Returns a read-only CSRGraph snapshot of g
+    """
+    labels: List[Vertex] = list(g._vertices)
+    index = {v: i for i, v in enumerate(labels)}
+
+    offsets = array('l', [0])
+    targets = array('l')
+    weights: List[Any] = []
+
+    for v in labels:
+        row = sorted(
+            (index[w], weight) for w, weight in g._vertices[v].items()
+        )
+
+        for t, weight in row:
+            targets.append(t)
+            weights.append(weight)
+
+        offsets.append(len(targets))
+
+    return CSRGraph(labels, offsets, targets, _pack(weights),
+                    directed=g.directed)
+
+
+def _pack(weights: List[Any]) -> Sequence[Any]:
+    """
+    Returns the weights as an array of C longs, or else of doubles, or as
+    they are if neither keeps every value exactly
+    """
+    try:
+        return array('l', weights)
+    except OverflowError:
+        return weights
+    except TypeError:
+        pass
+
+    try:
+        column = array('d', weights)
+    except (TypeError, OverflowError):
+        return weights
+
+    # doubles round integers beyond 2 ** 53
+    if all(a == b for a, b in zip(column, weights)):
+        return column
+
+    return weights
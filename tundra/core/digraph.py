@@ -1,4 +1,7 @@
-from typing import Dict, Hashable, Iterable, Set, Tuple, TypeVar, Union
+from itertools import chain
+from typing import (Any, Callable, Dict, FrozenSet, Hashable, ItemsView,
+                    Iterable, Iterator, KeysView, Optional, Sequence, Set,
+                    Tuple, TypeVar, Union)
 
 __all__ = ('Digraph', 'Vertex', 'EdgeTuple')
 
@@ -7,36 +10,59 @@ Vertex = Union[Hashable, int]
 EdgeTuple = TypeVar('EdgeTuple', Tuple[Vertex, Vertex],
                     Tuple[Vertex, Vertex, int])
 
+T = TypeVar('T')
 
-class Weight:
-    def __init__(
-            self,
-            _vertices: Dict[Vertex, Dict[Vertex, int]],
-            symmetrical: bool,
-    ) -> None:
 
-        self._vertices = _vertices
-        self._symmetrical = symmetrical
+def _rows(edges: Any) -> Iterator[Sequence[Any]]:
+    """
+    Iterates over the edges, converting NumPy arrays to Python scalars a
+    block of rows at a time
+    """
+    if not hasattr(edges, 'ndim'):
+        yield from edges
+        return
+
+    for i in range(0, len(edges), 65536):
+        yield from edges[i:i + 65536].tolist()
+
+
+def _column(values: Any) -> Iterable[Any]:
+    """
+    Returns a NumPy vector as a list of Python scalars, or values as is
+    """
+    if hasattr(values, 'ndim'):
+        return values.tolist()
+
+    return values
+
+
+class Weight:
+    def __init__(self, graph: 'Digraph') -> None:
+        self._graph = graph
 
     def __getitem__(self, item: Tuple[Vertex, Vertex]) -> int:
         v1, v2 = item
-        return self._vertices[v1][v2]
+        return self._graph._vertices[v1][v2]
 
     def __setitem__(self, item: Tuple[Vertex, Vertex], weight: int):
         v1, v2 = item
 
-        if v2 not in self._vertices[v1]:
+        g = self._graph
+
+        if v2 not in g._vertices[v1]:
             raise KeyError(
                 f'{v1} and {v2} are not neighbors'
             )
 
-        self._vertices[v1][v2] = weight
+        g._version += 1
 
-        if self._symmetrical:
-            self._vertices[v2][v1] = weight
+        g._vertices[v1][v2] = weight
+        g._predecessors[v2][v1] = weight
 
 
 class Digraph:
+    directed = True
+
     def __init__(
         self,
         vertices: Iterable[Vertex] = (),
@@ -45,35 +71,161 @@ class Digraph:
 
         self._vertices: Dict[Vertex, Dict[Vertex, int]] = {}
 
-        self.weight: Weight = Weight(self._vertices, False)
+        # incoming edges, kept in sync with _vertices by every mutation
+        self._predecessors: Dict[Vertex, Dict[Vertex, int]] = {}
+
+        self._size = 0
+
+        # bumped by every mutation, so that cached properties can tell
+        # whether they are stale
+        self._version = 0
+
+        # None while the cache is disabled; the histogram and components
+        # are built on first use and then maintained by the mutations
+        self._cache: Optional[Dict[Hashable, Any]] = None
+        self._cache_version = 0
+        self._histogram: Optional[Dict[int, int]] = None
+        self._degrees: Optional[Dict[Vertex, int]] = None
+        self._components: Optional[Any] = None
+
+        self.weight: Weight = Weight(self)
 
         for v in vertices:
             self.insert(v)
 
-        for e in edges:
-            self.link(*e)
+        self.add_edges_from(edges)
+
+    @classmethod
+    def from_edges(
+        cls,
+        edges: Iterable[EdgeTuple],
+        vertices: Iterable[Vertex] = (),
+        strict: bool = True,
+    ) -> 'Digraph':
+        """
+        Builds a graph from the edges, with the given vertices plus every
+        endpoint of an edge
+        """
+        g = cls(vertices)
+
+        g.add_edges_from(edges, strict)
+
+        return g
+
+    def add_edges_from(
+        self,
+        edges: Iterable[EdgeTuple],
+        strict: bool = True,
+    ) -> None:
+        """
+        Adds every edge in one pass, inserting the endpoints that are not
+        vertices yet
+
+        edges holds (v1, v2) or (v1, v2, weight) tuples, or is a NumPy array
+        of shape (E, 2) or (E, 3). If strict, an edge that already exists
+        raises ValueError, like link. Otherwise the duplicate is dropped
+        and its weight overwrites the previous one
+        """
+        successors = self._vertices
+        predecessors = self._predecessors
+
+        # cheaper to rebuild on the next query than to track edge by edge
+        self._version += 1
+        self._histogram = None
+        self._degrees = None
+        self._components = None
+
+        for e in _rows(edges):
+            if len(e) == 2:
+                v1, v2 = e
+                weight = 1
+            else:
+                v1, v2, weight = e
+
+            if v1 not in successors:
+                self.insert(v1)
+
+            if v2 not in successors:
+                self.insert(v2)
+
+            out = successors[v1]
+
+            if v2 in out:
+                if strict:
+                    raise ValueError(f'Edge ({v1}, {v2}) already exists')
+            else:
+                self._size += 1
+
+            out[v2] = weight
+            predecessors[v2][v1] = weight
+
+    def add_edge_columns(
+        self,
+        sources: Iterable[Vertex],
+        targets: Iterable[Vertex],
+        weights: Optional[Iterable[int]] = None,
+        strict: bool = True,
+    ) -> None:
+        """
+        Adds the edges given as parallel columns, such as array.array or
+        NumPy vectors, with add_edges_from
+
+        NumPy vectors are converted to Python scalars first, so vertices
+        and weights don't end up as NumPy types
+        """
+        if weights is None:
+            self.add_edges_from(
+                zip(_column(sources), _column(targets)), strict
+            )
+        else:
+            self.add_edges_from(
+                zip(_column(sources), _column(targets), _column(weights)),
+                strict,
+            )
 
     def insert(self, v: Vertex) -> None:
         """
         Adds the vertex v, if it doesn't exists
         """
-        if v in self.vertices:
+        if v in self._vertices:
             raise KeyError(f'{v} is already a vertex')
 
+        self._version += 1
+
         self._vertices[v] = {}
+        self._predecessors[v] = {}
+
+        if self._degrees is not None:
+            self._degrees[v] = 0
+            self._count_degree(0, 1)
+
+        if self._components is not None:
+            self._components.add(v)
 
     def remove(self, v: Vertex) -> None:
         """
         Removes the vertex v, if it exists
         """
-        for w in self.predecessors(v):
+        for w in list(self._predecessors[v]):
             self.unlink(w, v)
 
-        for w in self.successors(v):
+        for w in list(self._vertices[v]):
             self.unlink(v, w)
 
+        self._version += 1
+
+        if self._degrees is not None:
+            self._count_degree(self._degrees.pop(v), -1)
+
         del self._vertices[v]
 
+        # already gone if the predecessors are the successors themselves
+        self._predecessors.pop(v, None)
+
+        # even an isolated vertex stays in the union-find forest, which has
+        # no way to drop it
+        self._components = None
+
     def link(self, v1: Vertex, v2: Vertex, weight: int = 1) -> None:
         """
         Adds the edge from the vertices v1 to v2, if it doesn't exists
@@ -81,7 +233,25 @@ class Digraph:
         if self.has_edge(v1, v2):
             raise ValueError(f'Edge ({v1}, {v2}) already exists')
 
+        if v2 not in self._vertices:
+            raise KeyError(f'{v2} is not a vertex')
+
+        self._version += 1
+        self._size += 1
+
+        # the endpoints only gain a neighbor if they aren't already linked
+        # the other way
+        if self._degrees is not None and v2 not in self._predecessors[v1]:
+            self._shift_degree(v1, 1)
+
+            if v1 != v2:
+                self._shift_degree(v2, 1)
+
         self._vertices[v1][v2] = weight
+        self._predecessors[v2][v1] = weight
+
+        if self._components is not None:
+            self._components.union(v1, v2)
 
     def unlink(self, v1: Vertex, v2: Vertex) -> None:
         """
@@ -90,8 +260,100 @@ class Digraph:
         if not self.has_edge(v1, v2):
             raise ValueError(f'Edge ({v1}, {v2}) does not exist')
 
+        self._version += 1
+        self._size -= 1
+
         del self._vertices[v1][v2]
 
+        # already gone if this is a loop of an undirected graph
+        self._predecessors[v2].pop(v1, None)
+
+        # the endpoints stay neighbors if they are still linked the other way
+        if self._degrees is not None and v2 not in self._predecessors[v1]:
+            self._shift_degree(v1, -1)
+
+            if v1 != v2:
+                self._shift_degree(v2, -1)
+
+        # a removed edge may split a component, which union-find can't undo
+        self._components = None
+
+    def _shift_degree(self, v: Vertex, delta: int) -> None:
+        """
+        Adds delta to the maintained degree of v, moving it to another
+        histogram bucket in O(1)
+        """
+        degrees = self._degrees
+
+        assert degrees is not None
+
+        degree = degrees[v]
+        degrees[v] = degree + delta
+
+        self._count_degree(degree, -1)
+        self._count_degree(degree + delta, 1)
+
+    def _count_degree(self, degree: int, delta: int) -> None:
+        """
+        Adds delta to the histogram count of vertices with the degree
+        """
+        histogram = self._histogram
+
+        assert histogram is not None
+
+        count = histogram.get(degree, 0) + delta
+
+        if count:
+            histogram[degree] = count
+        else:
+            del histogram[degree]
+
+    @property
+    def version(self) -> int:
+        """
+        Returns a counter that changes on every mutation of the graph
+        """
+        return self._version
+
+    def enable_cache(self) -> None:
+        """
+        Memoizes the properties computed through cached until the graph is
+        mutated, and maintains the degree histogram and the connected
+        components as edges are linked
+        """
+        if self._cache is None:
+            self._cache = {}
+            self._cache_version = self._version
+
+    def disable_cache(self) -> None:
+        """
+        Drops every cached property and stops maintaining them
+        """
+        self._cache = None
+        self._histogram = None
+        self._degrees = None
+        self._components = None
+
+    def cached(self, key: Hashable, compute: Callable[[], T]) -> T:
+        """
+        Returns compute(), reusing the value stored under key if the cache
+        is enabled and the graph hasn't changed since it was computed
+        """
+        cache = self._cache
+
+        if cache is None:
+            return compute()
+
+        if self._cache_version != self._version:
+            cache.clear()
+            self._cache_version = self._version
+
+        try:
+            return cache[key]
+        except KeyError:
+            value = cache[key] = compute()
+            return value
+
     def has_edge(self, v1: Vertex, v2: Vertex) -> bool:
         """
         Return True if there is an edge between v1 and v2, False otherwise
@@ -110,14 +372,33 @@ class Digraph:
         """
         Returns a set containing the edges of the graph
         """
-        return {
-            (v1, v2, self.weight[v1, v2])
-            for v1 in self.vertices
-            for v2 in self.successors(v1)
-        }
+        if self._cache is None:
+            return set(self._edges())
+
+        return set(self.cached('edges', self._edges))
+
+    def _edges(self) -> FrozenSet[Tuple[Vertex, Vertex, int]]:
+        return frozenset(
+            (v1, v2, weight)
+            for v1, successors in self._vertices.items()
+            for v2, weight in successors.items()
+        )
+
+    @property
+    def size(self) -> int:
+        """
+        Returns the number of edges in the graph
+        """
+        return self._size
+
+    def vertex_view(self) -> KeysView[Vertex]:
+        """
+        Returns a read-only, live view of the vertices of the graph
+        """
+        return self._vertices.keys()
 
     def predecessors(self, v: Vertex) -> Set[Vertex]:
-        return {w for w in self.vertices if self.has_edge(w, v)}
+        return set(self._predecessors[v])
 
     def successors(self, v: Vertex) -> Set[Vertex]:
         return set(self._vertices[v])
@@ -126,13 +407,48 @@ class Digraph:
         """
         Returns a set containing the neighbors of v
         """
-        return self.predecessors(v) | self.successors(v)
+        return self._predecessors[v].keys() | self._vertices[v].keys()
+
+    def iter_predecessors(self, v: Vertex) -> KeysView[Vertex]:
+        """
+        Returns a read-only, live view of the predecessors of v
+        """
+        return self._predecessors[v].keys()
+
+    def iter_successors(self, v: Vertex) -> KeysView[Vertex]:
+        """
+        Returns a read-only, live view of the successors of v
+        """
+        return self._vertices[v].keys()
+
+    def iter_neighbors(self, v: Vertex) -> Iterable[Vertex]:
+        """
+        Iterates over the neighbors of v without copying them
+        """
+        successors = self._vertices[v]
+
+        return chain(
+            successors,
+            (w for w in self._predecessors[v] if w not in successors),
+        )
+
+    def weighted_predecessors(self, v: Vertex) -> ItemsView[Vertex, int]:
+        """
+        Returns a read-only, live view of the (predecessor, weight) pairs of v
+        """
+        return self._predecessors[v].items()
+
+    def weighted_successors(self, v: Vertex) -> ItemsView[Vertex, int]:
+        """
+        Returns a read-only, live view of the (successor, weight) pairs of v
+        """
+        return self._vertices[v].items()
 
     def indegree(self, v: Vertex) -> int:
-        return len(self.predecessors(v))
+        return len(self._predecessors[v])
 
     def outdegree(self, v: Vertex) -> int:
-        return len(self.successors(v))
+        return len(self._vertices[v])
 
     def degree(self, v: Vertex) -> int:
         """
@@ -140,6 +456,60 @@ class Digraph:
         """
         return len(self.neighbors(v))
 
+    def degree_histogram(self) -> Dict[int, int]:
+        """
+        Returns a map from each degree to the number of vertices with it
+
+        With the cache enabled, it is kept up to date by every mutation
+        """
+        histogram = self._histogram
+
+        if histogram is None:
+            degrees = {v: self.degree(v) for v in self._vertices}
+            histogram = {}
+
+            for degree in degrees.values():
+                histogram[degree] = histogram.get(degree, 0) + 1
+
+            # the degree of each vertex is kept too, so that a mutation
+            # can move it between buckets without recounting its neighbors
+            if self._cache is not None:
+                self._histogram = histogram
+                self._degrees = degrees
+
+        return dict(histogram)
+
+    def count_components(self) -> int:
+        """
+        Returns the number of connected components, ignoring the direction
+        of the edges
+
+        With the cache enabled, linking updates the count in O(1) amortized,
+        and only removals make it recount
+        """
+        return self._forest().count
+
+    def _forest(self) -> Any:
+        """
+        Returns the union-find forest of the connected components, which is
+        kept and updated on link while the cache is enabled
+        """
+        components = self._components
+
+        if components is None:
+            from .disjoint_set import DisjointSet
+
+            components = DisjointSet(self._vertices)
+
+            for v1, successors in self._vertices.items():
+                for v2 in successors:
+                    components.union(v1, v2)
+
+            if self._cache is not None:
+                self._components = components
+
+        return components
+
     @property
     def order(self) -> int:
         """
@@ -0,0 +1,81 @@
+from typing import Dict, Iterable
+
+from .digraph import Vertex
+
+__all__ = ('DisjointSet',)
+
+
+class DisjointSet:
+    """
+    Union-find forest over hashable elements, with union by rank and path
+    compression
+    """
+    def __init__(self, elements: Iterable[Vertex] = ()) -> None:
+        self._parent: Dict[Vertex, Vertex] = {}
+        self._rank: Dict[Vertex, int] = {}
+
+        self.count = 0
+
+        for e in elements:
+            self.add(e)
+
+    def add(self, e: Vertex) -> None:
+        """
+        Adds e as a singleton set, if it isn't already an element
+        """
+        if e not in self._parent:
+            self._parent[e] = e
+            self._rank[e] = 0
+            self.count += 1
+
+    def find(self, e: Vertex) -> Vertex:
+        """
+        Returns the representative of the set containing e
+        """
+        parent = self._parent
+
+        root = e
+
+        while parent[root] != root:
+            root = parent[root]
+
+        while parent[e] != root:
+            parent[e], e = root, parent[e]
+
+        return root
+
+    def union(self, e1: Vertex, e2: Vertex) -> bool:
+        """
+        Merges the sets containing e1 and e2
+
+        Returns False if they were already in the same set, True otherwise
+        """
+        r1 = self.find(e1)
+        r2 = self.find(e2)
+
+        if r1 == r2:
+            return False
+
+        if self._rank[r1] < self._rank[r2]:
+            r1, r2 = r2, r1
+
+        self._parent[r2] = r1
+
+        if self._rank[r1] == self._rank[r2]:
+            self._rank[r1] += 1
+
+        self.count -= 1
+
+        return True
+
+    def connected(self, e1: Vertex, e2: Vertex) -> bool:
+        """
+        Returns True if e1 and e2 are in the same set, False otherwise
+        """
+        return self.find(e1) == self.find(e2)
+
+    def __contains__(self, e: object) -> bool:
+        return e in self._parent
+
+    def __len__(self) -> int:
+        return len(self._parent)
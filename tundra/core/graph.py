@@ -1,53 +1,52 @@
-from typing import Iterable, Set, Tuple
+from typing import FrozenSet, Iterable, KeysView, Set, Tuple
 
-from .digraph import Digraph, EdgeTuple, Vertex, Weight
+from .digraph import Digraph, EdgeTuple, Vertex
 
 __all__ = ('Graph',)
 
 
 class Graph(Digraph):
+    directed = False
+
     def __init__(
         self,
         vertices: Iterable[Vertex] = (),
         edges: Iterable[EdgeTuple] = (),
     ) -> None:
 
-        super().__init__(vertices)
+        super().__init__()
 
-        self.weight: Weight = Weight(self._vertices, True)
+        # an undirected graph is its own reverse, so the incoming edges
+        # share storage with the outgoing ones and every link made by
+        # Digraph is automatically mirrored
+        self._predecessors = self._vertices
 
-        for e in edges:
-            self.link(*e)
+        for v in vertices:
+            self.insert(v)
 
-    def link(self, v1: Vertex, v2: Vertex, weight: int = 1) -> None:
-        """
-        Adds the edge from the vertices v1 to v2, if it doesn't exists
-        """
-        super().link(v1, v2, weight)
-        if v1 != v2:
-            super().link(v2, v1, weight)
+        self.add_edges_from(edges)
+
+    def _edges(self) -> FrozenSet[Tuple[Vertex, Vertex, int]]:
+        return frozenset(
+            (min(v1, v2), max(v1, v2), weight)
+            for v1, neighbors in self._vertices.items()
+            for v2, weight in neighbors.items()
+        )
 
-    def unlink(self, v1: Vertex, v2: Vertex) -> None:
+    def neighbors(self, v: Vertex) -> Set[Vertex]:
         """
-        Removes the edge from the vertices v1 to v2
+        Returns a set containing the neighbors of v
         """
-        super().unlink(v1, v2)
-        if v1 != v2:
-            super().unlink(v2, v1)
+        return set(self._vertices[v])
 
-    @property
-    def edges(self) -> Set[Tuple[Vertex, Vertex, int]]:
+    def degree(self, v: Vertex) -> int:
         """
-        Returns a set containing the edges of the graph
+        Returns the number of neighbors of v
         """
-        return {
-            (min(v1, v2), max(v1, v2), self.weight[v1, v2])
-            for v1 in self.vertices
-            for v2 in self.neighbors(v1)
-        }
+        return len(self._vertices[v])
 
-    def neighbors(self, v: Vertex) -> Set[Vertex]:
+    def iter_neighbors(self, v: Vertex) -> KeysView[Vertex]:
         """
-        Returns a set containing the neighbors of v
+        Returns a read-only, live view of the neighbors of v
         """
-        return set(self._vertices[v].keys())
+        return self._vertices[v].keys()
@@ -0,0 +1,112 @@
+from collections import OrderedDict
+from typing import (Callable, Dict, ItemsView, Iterable, KeysView, Optional,
+                    Tuple, Union)
+
+from .digraph import Vertex
+
+__all__ = ('ImplicitGraph',)
+
+Successors = Callable[
+    [Vertex],
+    Iterable[Union[Vertex, Tuple[Vertex, int]]]
+]
+
+
+class ImplicitWeight:
+    def __init__(self, graph: 'ImplicitGraph') -> None:
+        self._graph = graph
+
+    def __getitem__(self, item: Tuple[Vertex, Vertex]) -> int:
+        v1, v2 = item
+
+        successors = self._graph._expand(v1)
+
+        if v2 not in successors:
+            raise KeyError(f'{v1} and {v2} are not neighbors')
+
+        return successors[v2]
+
+    def __setitem__(self, item: Tuple[Vertex, Vertex], weight: int):
+        raise TypeError('ImplicitGraph is read-only')
+
+
+class ImplicitGraph:
+    """
+    Read-only directed graph whose edges are produced on demand by a
+    successor function, so that huge state spaces can be searched without
+    building them
+
+    successors(v) yields the successors of v, or (successor, weight) pairs
+    if weighted is True. Expanded vertices are memoized, keeping only the
+    cache_size most recently used ones so that memory stays bounded; 0
+    turns the memo off, and None keeps every expanded vertex
+    """
+    def __init__(
+            self,
+            successors: Successors,
+            weighted: bool = False,
+            cache_size: Optional[int] = 1024,
+    ) -> None:
+
+        self._successors = successors
+        self._weighted = weighted
+        self._cache_size = cache_size
+
+        self._cache: 'OrderedDict[Vertex, Dict[Vertex, int]]' = OrderedDict()
+
+        self.weight: ImplicitWeight = ImplicitWeight(self)
+
+    def _expand(self, v: Vertex) -> Dict[Vertex, int]:
+        """
+        Returns a map from each successor of v to the weight of its edge
+        """
+        cache = self._cache
+
+        successors = cache.get(v)
+
+        if successors is not None:
+            cache.move_to_end(v)
+
+            return successors
+
+        if self._weighted:
+            successors = dict(self._successors(v))  # type: ignore
+        else:
+            successors = dict.fromkeys(self._successors(v), 1)
+
+        if self._cache_size != 0:
+            cache[v] = successors
+
+            if self._cache_size is not None and \
+                    len(cache) > self._cache_size:
+                cache.popitem(last=False)
+
+        return successors
+
+    def has_edge(self, v1: Vertex, v2: Vertex) -> bool:
+        """
+        Return True if there is an edge between v1 and v2, False otherwise
+        """
+        return v2 in self._expand(v1)
+
+    def iter_successors(self, v: Vertex) -> KeysView[Vertex]:
+        """
+        Returns a read-only view of the successors of v
+        """
+        return self._expand(v).keys()
+
+    def iter_neighbors(self, v: Vertex) -> KeysView[Vertex]:
+        """
+        Returns a read-only view of the successors of v, since only outgoing
+        edges can be discovered
+        """
+        return self._expand(v).keys()
+
+    def weighted_successors(self, v: Vertex) -> ItemsView[Vertex, int]:
+        """
+        Returns a read-only view of the (successor, weight) pairs of v
+        """
+        return self._expand(v).items()
+
+    def outdegree(self, v: Vertex) -> int:
+        return len(self._expand(v))
@@ -1,10 +1,31 @@
-from subprocess import run
-from typing import Callable
+import asyncio
+import gzip
+import os
+import pickle
+import re
+import struct
+import sys
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, suppress
+from mmap import ACCESS_READ, mmap as memory_map
+from subprocess import PIPE, CalledProcessError, Popen
+from typing import (IO, Any, Callable, Dict, Iterable, Iterator, List,
+                    Optional, Sequence, Tuple, Union, cast)
 
-from tundra import Graph, Vertex
-from tundra.algorithm import is_complete, is_tree
+from tundra import CSRGraph, Digraph, Graph, Vertex, freeze
+from tundra.algorithm import has_directed_cycle, is_complete, is_tree
 
-__all__ = ('Filter', 'to_dot', 'export_dot', 'export_png')
+__all__ = ('Filter', 'to_dot', 'iter_dot', 'write_dot', 'read_dot',
+           'export_dot', 'export_png', 'export_png_async', 'export_many',
+           'read_edgelist', 'write_edgelist', 'read_adjlist', 'write_adjlist',
+           'save', 'load')
+
+# a path, or an already open text file such as a pipe
+File = Union[str, IO[str]]
+
+# buffer size used when reading and writing graph files
+_BUFFER_SIZE = 1 << 20
 
 
 class Filter:
@@ -21,19 +42,30 @@ VertexToString = Callable[[Vertex], str]
 EdgeToColor = Callable[[Vertex, Vertex, int], str]
 
 
-def to_dot(
-    g: Graph,
+def _quote(s: str) -> str:
+    return '"' + s.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def iter_dot(
+    g: Digraph,
     to_str: VertexToString = str,
     force_weight: bool = False,
     edge_color: EdgeToColor = None
-) -> str:
+) -> Iterator[str]:
+    """
+    Lazily yields the DOT representation of the graph, one statement at a
+    time, as a digraph if the graph is directed
+    """
     edge_color = edge_color or (lambda *args: None)
 
-    dot = ['graph {\n']
-
-    for v1, v2, w in g.edges:
-        dot += ['"', to_str(v1), '" -- "', to_str(v2), '"']
+    if g.directed:
+        yield 'digraph {\n'
+        edge = '->'
+    else:
+        yield 'graph {\n'
+        edge = '--'
 
+    for v1, v2, w in _iter_edges(g):
         opts = []
 
         if w != 1 or force_weight:
@@ -45,45 +77,657 @@ def to_dot(
             opts.append(f'color="{color}"')
 
         if len(opts) > 0:
-            dot += [
-                ' [',
-                *opts,
-                ']'
-            ]
+            yield (f'{_quote(to_str(v1))} {edge} {_quote(to_str(v2))} '
+                   f'[{"".join(opts)}];\n')
+        else:
+            yield f'{_quote(to_str(v1))} {edge} {_quote(to_str(v2))};\n'
+
+    for v in g.vertex_view():
+        if g.outdegree(v) == 0 and g.indegree(v) == 0:
+            yield f'{_quote(to_str(v))};\n'
+
+    yield '}'
+
+
+def to_dot(g: Digraph, **kwargs) -> str:
+    return ''.join(iter_dot(g, **kwargs))
+
+
+def write_dot(g: Digraph, file: File, **kwargs) -> None:
+    """
+    Streams the DOT representation of the graph to a path or an open file,
+    without building it in memory
+    """
+    with _open(file, 'w') as f:
+        for chunk in iter_dot(g, **kwargs):
+            f.write(chunk)
+
+
+def export_dot(g: Digraph, filename: str, **kwargs):
+    write_dot(g, filename, **kwargs)
+
+
+_DOT_TOKEN = re.compile(r'''
+      (?P<skip>\s+ | //[^\n]* | \#[^\n]* | /\*.*?\*/)
+    | "(?P<string>(?:[^"\\]|\\.)*)"
+    | (?P<id>[A-Za-z_\x80-\uffff][\w\x80-\uffff]* | -?(?:\.\d+|\d+(?:\.\d*)?))
+    | (?P<op>--|->|[{}\[\];,=:])
+''', re.VERBOSE | re.DOTALL)
+
+
+_DOT_ESCAPE = re.compile(r'\\(["\\])')
+
+
+def _dot_tokens(lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """
+    Splits DOT source in (kind, text) tokens, a line at a time, where kind
+    is 'id', 'string' or the operator itself
+    """
+    carry = ''
+
+    for line in lines:
+        text = carry + line
+        carry = ''
+
+        pos = 0
 
-        dot.append(';\n')
+        while pos < len(text):
+            m = _DOT_TOKEN.match(text, pos)
 
-    for v in g.vertices:
-        if len(g.neighbors(v)) == 0:
-            dot += ['"', to_str(v), '";\n']
+            if m is None:
+                if text.startswith(('"', '/*'), pos):
+                    # a string or comment that continues on the next line
+                    carry = text[pos:]
+                    break
 
-    dot.append('}')
+                raise ValueError(f'unexpected {text[pos]!r} in DOT source')
 
-    return ''.join(dot)
+            pos = m.end()
 
+            kind = m.lastgroup
 
-def export_dot(g: Graph, filename: str, **kwargs):
-    dot = to_dot(g, **kwargs)
+            if kind == 'string':
+                yield kind, _DOT_ESCAPE.sub(r'\1', m.group(kind))
+            elif kind == 'id':
+                yield kind, m.group(kind)
+            elif kind == 'op':
+                yield m.group(kind), m.group(kind)
 
-    with open(filename, 'w') as file:
-        file.write(dot)
+    if carry:
+        raise ValueError('unterminated string or comment in DOT source')
 
 
-def export_png(g: Graph, filename: str, command: str = None, **kwargs):
-    dot = to_dot(g, **kwargs)
+class _DotParser:
+    """
+    Recursive descent parser for the subset of DOT written by iter_dot:
+    node, edge and attribute statements, without subgraphs
+    """
+    def __init__(
+        self,
+        tokens: Iterator[Tuple[str, str]],
+        vertex_type: Callable[[str], Vertex],
+        weight_type: Callable[[str], int],
+    ) -> None:
 
-    if not command:
-        if is_tree(g):
-            command = Filter.DOT
-        elif is_complete(g):
-            command = Filter.CIRCO
+        self._tokens = tokens
+        self._vertex_type = vertex_type
+        self._weight_type = weight_type
+
+        self._next()
+
+    def _next(self) -> None:
+        self._kind, self._text = next(self._tokens, ('eof', ''))
+
+    def _keyword(self, *keywords: str) -> bool:
+        return self._kind == 'id' and self._text.lower() in keywords
+
+    def _expect(self, kind: str) -> str:
+        if self._kind != kind and not (
+                kind == 'id' and self._kind == 'string'):
+            raise ValueError(
+                f'expected {kind} in DOT source, got {self._text!r}'
+            )
+
+        text = self._text
+
+        self._next()
+
+        return text
+
+    def parse(self) -> Digraph:
+        if self._keyword('strict'):
+            self._next()
+
+        g: Digraph
+
+        if self._keyword('graph'):
+            g, arrow = Graph(), '--'
+        elif self._keyword('digraph'):
+            g, arrow = Digraph(), '->'
         else:
-            command = Filter.SFDP
+            raise ValueError('DOT source must start with graph or digraph')
+
+        self._next()
+
+        if self._kind in ('id', 'string'):
+            self._next()
+
+        self._expect('{')
+
+        while self._kind != '}':
+            self._statement(g, arrow)
+
+            if self._kind in (';', ','):
+                self._next()
+
+        self._expect('}')
+
+        return g
+
+    def _statement(self, g: Digraph, arrow: str) -> None:
+        if self._keyword('subgraph') or self._kind == '{':
+            raise ValueError('subgraphs are not supported')
+
+        if self._keyword('graph', 'node', 'edge'):
+            self._next()
+            self._attributes()
+            return
+
+        first = self._expect('id')
+
+        if self._kind == '=':
+            self._next()
+            self._expect('id')
+            return
+
+        vertices = [self._vertex(first)]
+
+        while self._kind in ('--', '->'):
+            if self._kind != arrow:
+                raise ValueError(f'{self._kind} edge in a graph using {arrow}')
+
+            self._next()
+
+            vertices.append(self._vertex(self._expect('id')))
+
+        attributes = self._attributes()
+
+        for v in vertices:
+            if v not in g.vertex_view():
+                g.insert(v)
+
+        # labels of node statements are names, not weights
+        if len(vertices) == 1:
+            return
+
+        label = attributes.get('label')
+        weight = 1 if label is None else self._weight_type(label)
+
+        g.add_edges_from(
+            ((v1, v2, weight) for v1, v2 in zip(vertices, vertices[1:])),
+            strict=False,
+        )
+
+    def _vertex(self, text: str) -> Vertex:
+        # ports (a:n:s) are ignored
+        while self._kind == ':':
+            self._next()
+            self._expect('id')
+
+        return self._vertex_type(text)
+
+    def _attributes(self) -> Dict[str, str]:
+        attributes: Dict[str, str] = {}
+
+        while self._kind == '[':
+            self._next()
+
+            while self._kind != ']':
+                key = self._expect('id')
+                self._expect('=')
+                attributes[key] = self._expect('id')
+
+                if self._kind in (';', ','):
+                    self._next()
+
+            self._next()
+
+        return attributes
+
+
+def _number(text: str) -> Any:
+    """
+    Parses text as an int, or as a float if it isn't one
+    """
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def read_dot(
+    file: File,
+    vertex_type: Callable[[str], Vertex] = str,
+    weight_type: Callable[[str], int] = _number,
+) -> Digraph:
+    """
+    Reads a Graph or Digraph from DOT source, taking the edge weights from
+    their label attribute, as ints or else floats by default
+
+    The source is tokenized as it is read. Subgraphs are not supported
+    """
+    with _open(file, 'r') as f:
+        return _DotParser(_dot_tokens(f), vertex_type, weight_type).parse()
+
+
+def _layout(g: Digraph) -> str:
+    """
+    Picks the Graphviz filter for the graph: dot for trees and directed
+    acyclic graphs, circo for complete graphs and sfdp otherwise
+
+    is_tree compares the edge count, kept by the graph, before checking
+    connectivity, and every test is memoized when the graph cache is on
+    """
+    if g.directed:
+        return Filter.SFDP if has_directed_cycle(g) else Filter.DOT
+
+    if is_tree(g):
+        return Filter.DOT
+
+    if is_complete(g):
+        return Filter.CIRCO
+
+    return Filter.SFDP
+
+
+def export_png(
+    g: Digraph,
+    filename: str,
+    command: Optional[str] = None,
+    **kwargs
+) -> None:
+    """
+    Renders the graph to a PNG file, streaming its DOT representation to
+    the Graphviz process
+    """
+    command = command or _layout(g)
 
     with open(filename, 'wb') as file:
-        run(
-            [command, '-Tpng'],
-            input=dot.encode('utf-8'),
-            stdout=file,
-            check=True,
+        process = Popen([command, '-Tpng'], stdin=PIPE, stdout=file)
+        stdin = cast(IO[bytes], process.stdin)
+
+        # graphviz may exit without reading everything, its exit status tells
+        # why; closing flushes the buffer, so a closed pipe may show up there
+        try:
+            for chunk in iter_dot(g, **kwargs):
+                stdin.write(chunk.encode('utf-8'))
+        except BrokenPipeError:
+            pass
+        finally:
+            with suppress(BrokenPipeError):
+                stdin.close()
+
+        returncode = process.wait()
+
+    if returncode != 0:
+        raise CalledProcessError(returncode, command)
+
+
+async def export_png_async(
+    g: Digraph,
+    filename: str,
+    command: Optional[str] = None,
+    **kwargs
+) -> None:
+    """
+    Asynchronous version of export_png, so that many graphs can be rendered
+    concurrently from an event loop
+    """
+    command = command or _layout(g)
+
+    with open(filename, 'wb') as file:
+        process = await asyncio.create_subprocess_exec(
+            command, '-Tpng', stdin=PIPE, stdout=file,
         )
+
+        stdin = cast(asyncio.StreamWriter, process.stdin)
+
+        try:
+            for chunk in iter_dot(g, **kwargs):
+                stdin.write(chunk.encode('utf-8'))
+                await stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            # graphviz exited without reading everything, its exit status
+            # tells why
+            pass
+        finally:
+            stdin.close()
+
+        returncode = await process.wait()
+
+    if returncode != 0:
+        raise CalledProcessError(returncode, command)
+
+
+def export_many(
+    jobs: Iterable[Tuple[Digraph, str]],
+    workers: Optional[int] = None,
+    command: Optional[str] = None,
+    **kwargs
+) -> None:
+    """
+    Renders each (graph, filename) pair to a PNG file, running at most
+    workers Graphviz processes at a time (by default, one per CPU)
+
+    Raises the first error of a failed render, after the others are done
+    """
+    with ThreadPoolExecutor(workers or os.cpu_count()) as executor:
+        futures = [
+            executor.submit(export_png, g, filename, command, **kwargs)
+            for g, filename in jobs
+        ]
+
+    for future in futures:
+        future.result()
+
+
+@contextmanager
+def _open(file: File, mode: str) -> Iterator[IO[str]]:
+    """
+    Opens a path for text I/O through a large buffer, transparently
+    (de)compressing gzip files, or passes an open file through
+    """
+    if not isinstance(file, str):
+        yield file
+        return
+
+    compressed = file.endswith('.gz')
+
+    if mode == 'r' and not compressed:
+        with open(file, 'rb') as raw:
+            compressed = raw.read(2) == b'\x1f\x8b'
+
+    f: IO[str]
+
+    if compressed:
+        f = cast(IO[str], gzip.open(file, mode + 't', encoding='utf-8'))
+    else:
+        f = open(file, mode, buffering=_BUFFER_SIZE, encoding='utf-8')
+
+    with f:
+        yield f
+
+
+def _fields(
+    lines: Iterable[str],
+    delimiter: Optional[str],
+) -> Iterator[Tuple[int, List[str]]]:
+    """
+    Splits each line in fields, skipping blank lines and # comments
+    """
+    for n, line in enumerate(lines, 1):
+        line = line.strip()
+
+        if not line or line.startswith('#'):
+            continue
+
+        if delimiter is None:
+            yield n, line.split()
+        else:
+            yield n, [field.strip() for field in line.split(delimiter)]
+
+
+def _iter_edges(g: Digraph) -> Iterator[Tuple[Vertex, Vertex, int]]:
+    """
+    Yields every edge once in O(V + E), without comparing vertices
+    """
+    if g.directed:
+        for v1 in g.vertex_view():
+            for v2, w in g.weighted_successors(v1):
+                yield v1, v2, w
+
+        return
+
+    # an undirected edge is stored at both endpoints, so it is yielded from
+    # whichever one is visited first
+    done = set()
+
+    for v1 in g.vertex_view():
+        for v2, w in g.weighted_successors(v1):
+            if v2 not in done:
+                yield v1, v2, w
+
+        done.add(v1)
+
+
+def read_edgelist(
+    file: File,
+    directed: bool = False,
+    delimiter: Optional[str] = None,
+    vertex_type: Callable[[str], Vertex] = str,
+    weight_type: Callable[[str], int] = int,
+    strict: bool = False,
+) -> Digraph:
+    """
+    Reads a graph from lines of "v1 v2" or "v1 v2 weight"
+
+    Fields are separated by whitespace, or by delimiter (for instance ','
+    for CSV). Lines are parsed as they are read and fed straight into
+    add_edges_from, so the file is never held in memory. Duplicated edges
+    keep the last weight unless strict
+    """
+    g = Digraph() if directed else Graph()
+
+    def edges(lines: Iterable[str]) -> Iterator[Tuple]:
+        for n, fields in _fields(lines, delimiter):
+            if len(fields) == 2:
+                yield vertex_type(fields[0]), vertex_type(fields[1])
+            elif len(fields) == 3:
+                yield (vertex_type(fields[0]), vertex_type(fields[1]),
+                       weight_type(fields[2]))
+            else:
+                raise ValueError(
+                    f'line {n}: expected 2 or 3 fields, got {len(fields)}'
+                )
+
+    with _open(file, 'r') as f:
+        g.add_edges_from(edges(f), strict)
+
+    return g
+
+
+def write_edgelist(g: Digraph, file: File, delimiter: str = ' ') -> None:
+    """
+    Writes one edge per line, with its weight as a third field when it
+    isn't 1
+
+    Isolated vertices can't be represented, use write_adjlist to keep them
+    """
+    with _open(file, 'w') as f:
+        for v1, v2, w in _iter_edges(g):
+            if w == 1:
+                f.write(f'{v1}{delimiter}{v2}\n')
+            else:
+                f.write(f'{v1}{delimiter}{v2}{delimiter}{w}\n')
+
+
+def read_adjlist(
+    file: File,
+    directed: bool = False,
+    delimiter: Optional[str] = None,
+    vertex_type: Callable[[str], Vertex] = str,
+    strict: bool = False,
+) -> Digraph:
+    """
+    Reads a graph from lines of "v n1 n2 ...", linking v to each n
+
+    A line with a single vertex inserts it without edges. Duplicated edges
+    are ignored unless strict
+    """
+    g = Digraph() if directed else Graph()
+
+    with _open(file, 'r') as f:
+        for _, fields in _fields(f, delimiter):
+            v = vertex_type(fields[0])
+
+            if v not in g.vertex_view():
+                g.insert(v)
+
+            g.add_edges_from(
+                ((v, vertex_type(n)) for n in fields[1:]), strict
+            )
+
+    return g
+
+
+def write_adjlist(g: Digraph, file: File, delimiter: str = ' ') -> None:
+    """
+    Writes each vertex followed by its successors, one vertex per line
+
+    Each undirected edge is written only once, and weights are dropped
+    """
+    done = set()
+
+    with _open(file, 'w') as f:
+        for v in g.vertex_view():
+            f.write(str(v))
+
+            for n in g.iter_successors(v):
+                if g.directed or n not in done:
+                    f.write(f'{delimiter}{n}')
+
+            f.write('\n')
+
+            if not g.directed:
+                done.add(v)
+
+
+# binary format: header, pickled vertex table padded to 8 bytes, then the
+# int64 offsets and targets and the int64 or float64 weights of a CSRGraph,
+# all little-endian
+_MAGIC = b'TNDR'
+_VERSION = 1
+
+# magic, version, flags, vertices, edge entries, size of the vertex table
+_HEADER = struct.Struct('<4sHHQQQ')
+
+_DIRECTED = 1
+_FLOAT_WEIGHTS = 2
+
+
+def _write_array(f: IO[bytes], values: Sequence, typecode: str) -> None:
+    a = array(typecode, values)
+
+    if sys.byteorder == 'big':
+        a.byteswap()
+
+    a.tofile(f)
+
+
+def _check_weights(weights: Sequence, floats: bool) -> None:
+    """
+    Raises ValueError for the first weight that would not be stored exactly
+    as a float64, or as an int64 if there are no floats
+    """
+    for w in weights:
+        try:
+            exact = float(w) == w if floats else -2 ** 63 <= w < 2 ** 63
+        except OverflowError:
+            exact = False
+
+        if not exact:
+            kind = 'float64' if floats else 'int64'
+
+            raise ValueError(f'weight {w} cannot be saved as an {kind}')
+
+
+def save(g: Union[Digraph, CSRGraph], path: str) -> None:
+    """
+    Writes the graph in tundra's binary format, which load can map into
+    memory
+
+    Vertices are stored with pickle, so they must be picklable, and weights
+    as int64 or float64, so one that doesn't fit raises ValueError
+    """
+    if not isinstance(g, CSRGraph):
+        g = freeze(g)
+
+    labels = pickle.dumps(list(g._labels), pickle.HIGHEST_PROTOCOL)
+
+    floats = any(isinstance(w, float) for w in g._weights)
+
+    # freeze only keeps the weights in a list when no array holds them
+    if not isinstance(g._weights, (array, memoryview)):
+        _check_weights(g._weights, floats)
+
+    flags = (_DIRECTED if g.directed else 0) | \
+        (_FLOAT_WEIGHTS if floats else 0)
+
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, flags, g.order,
+                             len(g._targets), len(labels)))
+
+        f.write(labels)
+        f.write(bytes(-len(labels) % 8))
+
+        _write_array(f, g._offsets, 'q')
+        _write_array(f, g._targets, 'q')
+        _write_array(f, g._weights, 'd' if floats else 'q')
+
+
+def load(path: str, mmap: bool = True) -> CSRGraph:
+    """
+    Reads a graph written by save, as a read-only CSRGraph
+
+    With mmap, the arrays are views over the memory-mapped file, so loading
+    is near-instant and processes loading the same file share its pages.
+    Only load files from trusted sources, since vertices are unpickled
+    """
+    with open(path, 'rb') as f:
+        magic, version, flags, order, size, labels_size = \
+            _HEADER.unpack(f.read(_HEADER.size))
+
+        if magic != _MAGIC:
+            raise ValueError(f'{path} is not a tundra graph file')
+
+        if version != _VERSION:
+            raise ValueError(f'unsupported tundra graph version {version}')
+
+        labels = pickle.loads(f.read(labels_size))
+
+        start = _HEADER.size + labels_size + (-labels_size % 8)
+
+        typecodes = 'qq' + ('d' if flags & _FLOAT_WEIGHTS else 'q')
+        lengths = (order + 1, size, size)
+
+        arrays: List[Sequence] = []
+
+        if mmap and sys.byteorder == 'little':
+            # the mapping outlives the file, and the views keep it alive
+            view = memoryview(memory_map(f.fileno(), 0, access=ACCESS_READ))
+
+            for typecode, length in zip(typecodes, lengths):
+                end = start + 8 * length
+
+                if typecode == 'd':
+                    arrays.append(view[start:end].cast('d'))
+                else:
+                    arrays.append(view[start:end].cast('q'))
+
+                start = end
+        else:
+            f.seek(start)
+
+            for typecode, length in zip(typecodes, lengths):
+                a = array(typecode)
+                a.frombytes(f.read(8 * length))
+
+                if sys.byteorder == 'big':
+                    a.byteswap()
+
+                arrays.append(a)
+
+    offsets, targets, weights = arrays
+
+    return CSRGraph(labels, offsets, targets, weights,
+                    directed=bool(flags & _DIRECTED))